@@ -0,0 +1,49 @@
+"""
+Measure the memory held by a fully loaded fleet of ShellHubDevice.
+
+Usage: python -m benchmarks.device_memory [device_count]
+"""
+
+import gc
+import sys
+import tracemalloc
+from unittest import mock
+
+from benchmarks.utils import make_fleet_json
+from benchmarks.utils import offline_shellhub
+from shellhub import ShellHubDevice
+from shellhub import ShellHubDeviceInfo
+
+
+def measure(count: int) -> int:
+    """
+    :return: The memory retained by the devices once the decoded API responses are released
+    """
+    api = offline_shellhub()
+    gc.collect()
+    tracemalloc.start()
+    fleet_json = make_fleet_json(count)
+    devices = [ShellHubDevice(api, device_json) for device_json in fleet_json]
+    del fleet_json
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del devices
+    return size
+
+
+def main(count: int) -> None:
+    # Without pooling: every device owns its strings and its ShellHubDeviceInfo
+    with mock.patch("sys.intern", lambda string: string):
+        with mock.patch.object(ShellHubDeviceInfo, "shared", ShellHubDeviceInfo):
+            unpooled = measure(count)
+    pooled = measure(count)
+
+    print(f"{count} devices")
+    print(f"  without pooling: {unpooled / 2**20:8.1f} MiB ({unpooled / count:.0f} B/device)")
+    print(f"  with pooling:    {pooled / 2**20:8.1f} MiB ({pooled / count:.0f} B/device)")
+    print(f"  saved:           {(unpooled - pooled) / 2**20:8.1f} MiB ({1 - pooled / unpooled:.0%})")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,33 @@
+"""
+Measure the time taken by `import shellhub` in a fresh interpreter, and what the lazily loaded models would add.
+
+Usage: python -m benchmarks.import_time [runs]
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+
+
+def measure(code: str, runs: int) -> float:
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def main(runs: int) -> None:
+    interpreter = measure("pass", runs)
+    package = measure("import shellhub", runs)
+    models = measure("import shellhub; shellhub.ShellHub", runs)
+
+    print(f"median of {runs} runs, interpreter startup excluded")
+    print(f"  import shellhub:                 {(package - interpreter) * 1000:6.1f} ms")
+    print(f"  import shellhub + ShellHub:      {(models - interpreter) * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
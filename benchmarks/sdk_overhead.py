@@ -0,0 +1,40 @@
+"""
+Measure the overhead of the SDK itself, against the in-memory simulator so that no network is involved.
+
+Usage: python -m benchmarks.sdk_overhead [device_count]
+"""
+
+import sys
+import time
+from typing import Callable
+
+from benchmarks.utils import make_device_json
+from shellhub import ShellHub
+from shellhub import ShellHubSimulator
+
+
+def report(label: str, operations: int, run: Callable[[], object]) -> None:
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<26} {operations / elapsed:>10,.0f} ops/s ({operations / elapsed * 60:>12,.0f} ops/min)")
+
+
+def main(count: int) -> None:
+    simulator = ShellHubSimulator(users={"admin": "admin"})
+    for index in range(count):
+        device_json = make_device_json(index)
+        simulator.add_device(**{**device_json, "status": "pending"})
+    api = ShellHub(username="admin", password="admin", endpoint_or_url="http://shellhub.local", transport=simulator)
+    uids = list(simulator.devices)
+
+    print(f"{count} devices")
+    report("get_device", count, lambda: [api.get_device(uid) for uid in uids])
+    devices = api.get_all_devices()
+    report("get_all_devices (devices)", count, api.get_all_devices)
+    report("rename", count, lambda: [device.rename(f"renamed-{device.uid}") for device in devices])
+    report("accept (with refresh)", count, lambda: [device.accept() for device in devices])
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
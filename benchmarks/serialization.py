@@ -0,0 +1,38 @@
+"""
+Measure the throughput of the device list serialization formats.
+
+Usage: python -m benchmarks.serialization [device_count]
+"""
+
+import sys
+import time
+
+from benchmarks.utils import make_fleet_json
+from benchmarks.utils import offline_shellhub
+from shellhub import dumps_devices
+from shellhub import loads_devices
+from shellhub import ShellHubDevice
+from shellhub.serialization import FORMATS
+
+
+def main(count: int) -> None:
+    api = offline_shellhub()
+    devices = [ShellHubDevice(api, device_json) for device_json in make_fleet_json(count)]
+
+    print(f"{count} devices")
+    for serialization_format in FORMATS:
+        start = time.perf_counter()
+        data = dumps_devices(devices, format=serialization_format)
+        dumped = time.perf_counter()
+        loads_devices(data, api, format=serialization_format)
+        loaded = time.perf_counter()
+
+        print(
+            f"  {serialization_format:<7} {len(data) / 2**20:6.1f} MiB | "
+            f"dump {count / (dumped - start):>9,.0f} devices/s | "
+            f"load {count / (loaded - dumped):>9,.0f} devices/s"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
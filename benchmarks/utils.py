@@ -0,0 +1,57 @@
+import json
+from typing import Any
+from typing import Dict
+from typing import List
+
+from shellhub import ShellHub
+
+NAMESPACES = ["dev", "staging", "prod", "lab"]
+INFOS = [
+    {"id": "ubuntu", "pretty_name": "Ubuntu 20.04.2 LTS", "version": "v0.14.1", "arch": "amd64", "platform": "docker"},
+    {"id": "ubuntu", "pretty_name": "Ubuntu 22.04.3 LTS", "version": "v0.14.1", "arch": "amd64", "platform": "native"},
+    {"id": "debian", "pretty_name": "Debian GNU/Linux 12", "version": "v0.14.1", "arch": "arm64", "platform": "native"},
+    {"id": "alpine", "pretty_name": "Alpine Linux v3.19", "version": "v0.13.4", "arch": "armv7", "platform": "docker"},
+]
+STATUSES = ["accepted", "accepted", "accepted", "pending", "rejected"]
+
+
+def make_device_json(index: int) -> Dict[str, Any]:
+    mac = ":".join(f"{(index >> shift) & 0xFF:02x}" for shift in (40, 32, 24, 16, 8, 0))
+    return {
+        "uid": f"{index:064x}",
+        "name": f"device-{index}",
+        "identity": {"mac": mac},
+        "info": INFOS[index % len(INFOS)],
+        "public_key": "-----BEGIN RSA PUBLIC KEY-----\nxxx\n-----END RSA PUBLIC KEY-----\n",
+        "tenant_id": f"tenant-{index % 3}",
+        "last_seen": "2024-01-01T00:00:00Z",
+        "online": index % 2 == 0,
+        "namespace": NAMESPACES[index % len(NAMESPACES)],
+        "status": STATUSES[index % len(STATUSES)],
+        "status_updated_at": "2024-01-01T00:00:00Z",
+        "created_at": "2024-01-01T00:00:00Z",
+        "remote_addr": "10.0.0.1",
+        "position": {"latitude": 0, "longitude": 0},
+        "tags": [],
+        "public_url": False,
+        "public_url_address": "",
+        "acceptable": False,
+    }
+
+
+def make_fleet_json(count: int) -> List[Dict[str, Any]]:
+    """
+    Build the JSON of a fleet the way the API returns it: decoded from a response body, so that no string is shared
+    between devices
+    """
+    return json.loads(json.dumps([make_device_json(index) for index in range(count)]))
+
+
+def offline_shellhub(endpoint: str = "shellhub.example.org") -> ShellHub:
+    """
+    Build a ShellHub client without logging in, to benchmark the SDK without any network involved
+    """
+    api = ShellHub.__new__(ShellHub)
+    api._url = f"https://{endpoint}"
+    api._endpoint = endpoint
+    return api
@@ -1,22 +1,81 @@
 # Increment versions here according to SemVer
-__version__ = "0.3.0"
+__version__ = "0.4.0"
+
+from typing import Any
+from typing import List
+from typing import TYPE_CHECKING
 
-from .models.device import ShellHubDevice, ShellHubDeviceInfo
-from .models.base import ShellHub
 from .exceptions import (
     ShellHubApiError,
     ShellHubAuthenticationError,
     DeviceNotFoundError,
     ShellHubBaseException,
+    ShellHubTimeoutError,
+    ShellHubClusterError,
 )
 
+if TYPE_CHECKING:
+    from .models.device import ShellHubDevice, ShellHubDeviceInfo
+    from .models.base import ShellHub
+    from .models.cluster import ShellHubCluster, ShellHubClusterDevice
+    from .serialization import dump_devices, dumps_devices, load_devices, loads_devices
+    from .simulator import ShellHubSimulator
+    from .transport import RequestsTransport, Transport
+    from .fleet import FleetCommandResult, FleetExecutor
+
+# The models pull `requests` in, which is slow to import. They are only loaded on first access, so that importing the
+# package for its exceptions or its version stays cheap.
+_LAZY_ATTRIBUTES = {
+    "ShellHub": ".models.base",
+    "ShellHubDevice": ".models.device",
+    "ShellHubDeviceInfo": ".models.device",
+    "ShellHubCluster": ".models.cluster",
+    "ShellHubClusterDevice": ".models.cluster",
+    "dump_devices": ".serialization",
+    "dumps_devices": ".serialization",
+    "load_devices": ".serialization",
+    "loads_devices": ".serialization",
+    "ShellHubSimulator": ".simulator",
+    "RequestsTransport": ".transport",
+    "Transport": ".transport",
+    "FleetExecutor": ".fleet",
+    "FleetCommandResult": ".fleet",
+}
 
 __all__ = [
     "ShellHub",
     "ShellHubDevice",
     "ShellHubDeviceInfo",
+    "ShellHubCluster",
+    "ShellHubClusterDevice",
+    "dump_devices",
+    "dumps_devices",
+    "load_devices",
+    "loads_devices",
+    "ShellHubSimulator",
+    "RequestsTransport",
+    "Transport",
+    "FleetExecutor",
+    "FleetCommandResult",
     "ShellHubApiError",
     "ShellHubAuthenticationError",
     "DeviceNotFoundError",
     "ShellHubBaseException",
+    "ShellHubTimeoutError",
+    "ShellHubClusterError",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    # Cache it, so that __getattr__ is only called once per attribute
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,184 @@
+"""
+Command line interface of the SDK, installed as the `shellhub` command.
+
+Credentials are read from the options, or from the SHELLHUB_URL, SHELLHUB_USERNAME and SHELLHUB_PASSWORD environment
+variables.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import IO
+from typing import Iterable
+from typing import List
+from typing import Optional
+
+from shellhub.exceptions import ShellHubBaseException
+from shellhub.models.base import DEFAULT_TIMEOUT
+from shellhub.models.base import ShellHub
+from shellhub.models.device import ShellHubDevice
+
+# Fields that can be exported, and how to get them from a device as JSON serializable values
+FIELDS: Dict[str, Callable[[ShellHubDevice], Any]] = {
+    "uid": lambda device: device.uid,
+    "name": lambda device: device.name,
+    "mac_address": lambda device: device.mac_address,
+    "info.id": lambda device: device.info.id,
+    "info.pretty_name": lambda device: device.info.pretty_name,
+    "info.version": lambda device: device.info.version,
+    "info.arch": lambda device: device.info.arch,
+    "info.platform": lambda device: device.info.platform,
+    "public_key": lambda device: device.public_key,
+    "tenant_id": lambda device: device.tenant_id,
+    "last_seen": lambda device: device.last_seen.isoformat(),
+    "online": lambda device: device.online,
+    "namespace": lambda device: device.namespace,
+    "status": lambda device: device.status,
+    "status_updated_at": lambda device: device.status_updated_at.isoformat(),
+    "created_at": lambda device: device.created_at.isoformat(),
+    "remote_addr": lambda device: device.remote_addr,
+    "tags": lambda device: device.tags,
+    "acceptable": lambda device: device.acceptable,
+    "sshid": lambda device: device.sshid,
+}
+
+
+def _parse_fields(value: str) -> List[str]:
+    fields = [field.strip() for field in value.split(",") if field.strip()]
+    unknown = [field for field in fields if field not in FIELDS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown field(s) {', '.join(unknown)}. Choose from {', '.join(FIELDS)}")
+    return fields
+
+
+def _parse_query(value: str) -> List[str]:
+    key, separator, query_value = value.partition("=")
+    if not separator or not key:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got {value}")
+    if key in ("page", "per_page"):
+        raise argparse.ArgumentTypeError(f"{key} is handled by the export, use --per-page to change the page size")
+    return [key, query_value]
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="shellhub", description="ShellHub command line interface")
+    parser.add_argument("--url", default=os.environ.get("SHELLHUB_URL"), help="ShellHub URL (env: SHELLHUB_URL)")
+    parser.add_argument(
+        "--username", default=os.environ.get("SHELLHUB_USERNAME"), help="ShellHub username (env: SHELLHUB_USERNAME)"
+    )
+    parser.add_argument(
+        "--password", default=os.environ.get("SHELLHUB_PASSWORD"), help="ShellHub password (env: SHELLHUB_PASSWORD)"
+    )
+    parser.add_argument("--no-ssl", action="store_true", help="Use http:// when the URL has no scheme")
+    parser.add_argument("--timeout", type=float, help="Timeout of each request, in seconds")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export = subparsers.add_parser(
+        "export", help="Export the device inventory", description="Stream the device inventory as NDJSON or CSV"
+    )
+    export.add_argument("--format", choices=["ndjson", "csv"], default="ndjson", help="Output format")
+    export.add_argument("--status", choices=["accepted", "rejected", "pending", "removed", "unused"])
+    export.add_argument(
+        "--query",
+        type=_parse_query,
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Extra query parameter sent to the API, can be repeated",
+    )
+    export.add_argument(
+        "--fields",
+        type=_parse_fields,
+        help=f"Comma separated fields to export. Defaults to the full device for NDJSON and to every field for CSV. "
+        f"Available: {', '.join(FIELDS)}",
+    )
+    export.add_argument("--workers", type=int, default=4, help="Number of pages fetched concurrently (default: 4)")
+    export.add_argument("--per-page", type=int, default=100, help="Number of devices per page (default: 100)")
+    export.add_argument("-o", "--output", help="Output file, defaults to stdout")
+    return parser
+
+
+def _select(device: ShellHubDevice, fields: List[str]) -> Dict[str, Any]:
+    return {field: FIELDS[field](device) for field in fields}
+
+
+def write_ndjson(devices: Iterable[ShellHubDevice], output: IO[str], fields: Optional[List[str]] = None) -> int:
+    """
+    Write each device on its own line as soon as it is received
+    :param fields: The fields to export. If None, devices are written in the format returned by the API
+    :return: The number of devices written
+    """
+    count = 0
+    for device in devices:
+        row = device.to_dict() if fields is None else _select(device, fields)
+        output.write(json.dumps(row, separators=(",", ":")))
+        output.write("\n")
+        count += 1
+    return count
+
+
+def write_csv(devices: Iterable[ShellHubDevice], output: IO[str], fields: Optional[List[str]] = None) -> int:
+    """
+    Write each device as a CSV row as soon as it is received. Lists are joined with commas
+    :param fields: The fields to export. If None, every field is exported
+    :return: The number of devices written
+    """
+    if fields is None:
+        fields = list(FIELDS)
+    writer = csv.writer(output)
+    writer.writerow(fields)
+    count = 0
+    for device in devices:
+        writer.writerow(
+            [",".join(value) if isinstance(value, list) else value for value in _select(device, fields).values()]
+        )
+        count += 1
+    return count
+
+
+def _export(api: ShellHub, args: argparse.Namespace, output: IO[str]) -> int:
+    devices = api.iter_devices(
+        status=args.status,
+        query_params=dict(args.query),
+        per_page=args.per_page,
+        workers=args.workers,
+    )
+    if args.format == "csv":
+        return write_csv(devices, output, args.fields)
+    return write_ndjson(devices, output, args.fields)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if not args.url or not args.username or not args.password:
+        parser.error("--url, --username and --password (or their environment variables) are required")
+    if args.command == "export" and (args.workers < 1 or args.per_page < 1):
+        parser.error("--workers and --per-page must be at least 1")
+
+    try:
+        with ShellHub(
+            username=args.username,
+            password=args.password,
+            endpoint_or_url=args.url,
+            use_ssl=not args.no_ssl,
+            timeout=args.timeout if args.timeout else DEFAULT_TIMEOUT,
+        ) as api:
+            if args.output:
+                with open(args.output, "w", newline="") as output:
+                    _export(api, args, output)
+            else:
+                _export(api, args, sys.stdout)
+    except ShellHubBaseException as e:
+        print(f"shellhub: error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
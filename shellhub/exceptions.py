@@ -1,3 +1,9 @@
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+
 class ShellHubBaseException(Exception):
     pass
 
@@ -12,3 +18,19 @@ class ShellHubAuthenticationError(ShellHubBaseException):
 
 class DeviceNotFoundError(ShellHubApiError):
     pass
+
+
+class ShellHubTimeoutError(ShellHubApiError):
+    pass
+
+
+class ShellHubClusterError(ShellHubBaseException):
+    """
+    Raised when some instances of a ShellHubCluster failed. The other instances were still queried: `errors` maps
+    the name of each failed instance to its exception, and `devices` holds what the healthy instances returned.
+    """
+
+    def __init__(self, errors: Dict[str, Exception], devices: Optional[List[Any]] = None) -> None:
+        self.errors = errors
+        self.devices = devices if devices is not None else []
+        super().__init__(f"{len(errors)} instance(s) failed: {', '.join(errors)}")
@@ -0,0 +1,224 @@
+"""
+Run a command on many devices at once, over SSH through the ShellHub gateway.
+
+The system `ssh` client is used, so the usual OpenSSH configuration and agent apply. Each command opens its own
+connection, unless multiplexing is enabled with `control_persist`: connections are then shared (ControlMaster) and
+kept open for a while, so running several commands on the same device only opens one connection.
+"""
+
+import concurrent.futures
+import os
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Set
+from typing import Union
+
+from shellhub.models.device import ShellHubDevice
+
+
+class FleetCommandResult(NamedTuple):
+    device: ShellHubDevice
+    # None if the command didn't run to completion, see `error`
+    exit_status: Optional[int]
+    stdout: str
+    stderr: str
+    duration: float
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.exit_status == 0
+
+
+class FleetExecutor:
+    """
+    Run a command over SSH on a fleet of devices, with bounded concurrency and a timeout per device
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 32,
+        timeout: float = 30.0,
+        port: int = 22,
+        identity_file: Optional[str] = None,
+        ssh_options: Optional[List[str]] = None,
+        ssh_command: Union[str, List[str]] = "ssh",
+        control_persist: Optional[int] = None,
+    ) -> None:
+        """
+        :param max_workers: Maximum number of commands running at the same time
+        :param timeout: Time after which a command is killed, in seconds, connection included
+        :param port: SSH port of the ShellHub gateway
+        :param identity_file: Private key used to authenticate, otherwise the ssh agent and configuration are used
+        :param ssh_options: Extra options passed to ssh as `-o` options, e.g. ["StrictHostKeyChecking=accept-new"]
+        :param ssh_command: The ssh executable, and optionally leading arguments
+        :param control_persist: Enables multiplexing: seconds an idle connection stays open after its last command.
+            The connections still open are closed by close()
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self._max_workers = max_workers
+        self._timeout = timeout
+        self._port = port
+        self._identity_file = identity_file
+        self._ssh_options = list(ssh_options or [])
+        self._ssh_command = [ssh_command] if isinstance(ssh_command, str) else list(ssh_command)
+        self._control_persist = control_persist
+        self._control_dir: Optional[str] = None
+        self._control_dir_lock = threading.Lock()
+
+    def __enter__(self) -> "FleetExecutor":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the multiplexed connections still open, and remove their control sockets
+        """
+        with self._control_dir_lock:
+            if self._control_dir is not None:
+                for socket_name in os.listdir(self._control_dir):
+                    self._exit_master(os.path.join(self._control_dir, socket_name))
+                shutil.rmtree(self._control_dir, ignore_errors=True)
+                self._control_dir = None
+
+    def _exit_master(self, control_path: str) -> None:
+        # The destination is required by ssh but unused: the control socket alone identifies the connection
+        arguments = self._ssh_command + ["-O", "exit", "-o", f"ControlPath={control_path}", "shellhub"]
+        try:
+            subprocess.run(
+                arguments,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=5,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            # The master process is left to time out by itself
+            pass
+
+    def _get_control_dir(self) -> str:
+        with self._control_dir_lock:
+            if self._control_dir is None:
+                # Kept short: unix socket paths are limited to about a hundred characters
+                self._control_dir = tempfile.mkdtemp(prefix="shellhub-ssh-")
+            return self._control_dir
+
+    def _ssh_arguments(self, sshid: str, command: str) -> List[str]:
+        user, _, endpoint = sshid.partition("@")
+        # The SSHID holds the HTTP endpoint, whose port isn't the one of the SSH gateway
+        host = endpoint.rsplit(":", 1)[0] if endpoint.count(":") == 1 else endpoint
+        arguments = self._ssh_command + [
+            "-T",
+            "-p",
+            str(self._port),
+            "-o",
+            "BatchMode=yes",
+            "-o",
+            f"ConnectTimeout={max(1, int(self._timeout))}",
+        ]
+        if self._control_persist is None:
+            # Otherwise a ControlMaster from the user's configuration would outlive the executor
+            arguments += ["-o", "ControlMaster=no"]
+        else:
+            arguments += [
+                "-o",
+                "ControlMaster=auto",
+                "-o",
+                f"ControlPath={self._get_control_dir()}/%C",
+                "-o",
+                f"ControlPersist={self._control_persist}",
+            ]
+        if self._identity_file:
+            arguments += ["-i", self._identity_file]
+        for option in self._ssh_options:
+            arguments += ["-o", option]
+        return arguments + [f"{user}@{host}", command]
+
+    def run_one(self, device: ShellHubDevice, command: str) -> FleetCommandResult:
+        """
+        Run a command on a single device
+        :return: The result. Failures to connect are reported by ssh with the exit status 255
+        """
+        start = time.monotonic()
+        sshid = device.sshid
+        if sshid is None:
+            return FleetCommandResult(device, None, "", "", 0.0, "Device has no SSHID, it is not accepted yet")
+
+        try:
+            process = subprocess.Popen(
+                self._ssh_arguments(sshid, command),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                encoding="utf-8",
+                errors="replace",
+                # Own process group, so that a timeout kills everything ssh may have spawned (e.g. a ProxyCommand)
+                start_new_session=True,
+            )
+        except OSError as e:
+            return FleetCommandResult(device, None, "", "", time.monotonic() - start, f"Couldn't start ssh: {e}")
+
+        try:
+            stdout, stderr = process.communicate(timeout=self._timeout)
+        except subprocess.TimeoutExpired:
+            self._kill(process)
+            try:
+                stdout, stderr = process.communicate(timeout=1)
+            except subprocess.TimeoutExpired:
+                stdout, stderr = "", ""
+            return FleetCommandResult(
+                device, None, stdout, stderr, time.monotonic() - start, f"Timed out after {self._timeout}s"
+            )
+        return FleetCommandResult(device, process.returncode, stdout, stderr, time.monotonic() - start)
+
+    @staticmethod
+    def _kill(process: "subprocess.Popen[str]") -> None:
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+                return
+            except OSError:
+                pass
+        process.kill()
+
+    def run(self, devices: Iterable[ShellHubDevice], command: str) -> Iterator[FleetCommandResult]:
+        """
+        Run a command on every device, yielding each result as soon as it is available. The devices are consumed
+        lazily, so a ShellHub.iter_devices() generator can be given directly.
+        :param devices: The devices to run the command on
+        :param command: The command, interpreted by the shell of the devices
+        """
+        pending = iter(devices)
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._max_workers, thread_name_prefix="shellhub-ssh"
+        )
+        running: "Set[concurrent.futures.Future[FleetCommandResult]]" = set()
+        try:
+            for device in pending:
+                running.add(executor.submit(self.run_one, device, command))
+                if len(running) >= self._max_workers:
+                    break
+            while running:
+                done, running = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    # Keep the pool full before handing the result over
+                    next_device: Optional[ShellHubDevice] = next(pending, None)
+                    if next_device is not None:
+                        running.add(executor.submit(self.run_one, next_device, command))
+                    yield future.result()
+        finally:
+            for future in running:
+                future.cancel()
+            executor.shutdown(wait=False)
@@ -1,6 +1,12 @@
+import concurrent.futures
 import re
+import threading
+import time
+from collections import deque
 from typing import Any
+from typing import Deque
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Optional
 from typing import Tuple
@@ -13,6 +19,19 @@ from shellhub.exceptions import DeviceNotFoundError
 from shellhub.exceptions import ShellHubApiError
 from shellhub.exceptions import ShellHubAuthenticationError
 from shellhub.exceptions import ShellHubBaseException
+from shellhub.exceptions import ShellHubTimeoutError
+from shellhub.transport import RequestsTransport
+from shellhub.transport import Timeout
+from shellhub.transport import Transport
+
+DEFAULT_TIMEOUT: Timeout = (10.0, 30.0)
+
+# Number of devices requested per page when paging through the device list
+DEFAULT_PAGE_SIZE = 100
+
+# Number of GET latencies kept to compute the hedging delay, and the minimum needed before hedging kicks in
+HEDGE_SAMPLE_SIZE = 256
+HEDGE_MIN_SAMPLES = 20
 
 
 class ShellHub:
@@ -22,15 +41,51 @@ class ShellHub:
     _url: str
     _access_token: Optional[str]
     _use_ssl: bool
+    _timeout: Optional[Timeout]
+    _deadline: Optional[float]
+    _hedge_percentile: Optional[float]
+    _optimistic_mutations: bool
+    _transport: Transport
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        endpoint_or_url: str,
+        use_ssl: bool = True,
+        timeout: Optional[Timeout] = DEFAULT_TIMEOUT,
+        deadline: Optional[float] = None,
+        hedge_percentile: Optional[float] = None,
+        optimistic_mutations: bool = False,
+        transport: Optional[Transport] = None,
+    ) -> None:
+        """
+        :param timeout: Default timeout for every HTTP request, in seconds or as a (connect, read) tuple.
+            None disables it.
+        :param deadline: Default overall time budget, in seconds, for every call (retries and pages included)
+        :param hedge_percentile: Opt-in hedged reads. When set, an idempotent GET slower than this percentile of the
+            recently observed GET latencies is sent a second time, and whichever answers first wins.
+        :param optimistic_mutations: Apply the expected result of device mutations (accept, rename) locally instead
+            of refreshing the device. Mutated devices are marked stale until confirmed with reconcile().
+        :param transport: What sends the HTTP requests. Defaults to a RequestsTransport going over the network
+        """
+        if hedge_percentile is not None and not 0 < hedge_percentile < 100:
+            raise ValueError("hedge_percentile must be between 0 and 100")
 
-    def __init__(self, username: str, password: str, endpoint_or_url: str, use_ssl: bool = True) -> None:
         self._username = username
         self._password = password
         self._use_ssl = use_ssl
         self._url, self._endpoint = self._format_and_validate_url(endpoint_or_url)
         self._access_token = None
+        self._timeout = timeout
+        self._deadline = deadline
+        self._hedge_percentile = hedge_percentile
+        self._optimistic_mutations = optimistic_mutations
+        self._transport = transport if transport is not None else RequestsTransport()
+        self._latencies: Deque[float] = deque(maxlen=HEDGE_SAMPLE_SIZE)
+        self._closed = False
 
-        self._login()
+        self._login(expires_at=self._expires_at(None))
 
     def _format_and_validate_url(self, endpoint: str) -> Tuple[str, str]:
         """
@@ -75,18 +130,76 @@ class ShellHub:
     def __repr__(self) -> str:
         return f"<ShellHub username={self._username} url={self._url}>"
 
+    def __enter__(self) -> "ShellHub":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stop hedging requests. Hedged attempts still running are abandoned: they run in daemon threads, so they never
+        delay the exit of the interpreter
+        """
+        self._closed = True
+
     def __str__(self) -> str:
         return self._url
 
-    def _login(self) -> None:
+    def _expires_at(self, deadline: Optional[float]) -> Optional[float]:
+        """
+        Turn a deadline relative to now into an absolute monotonic time
+        :param deadline: The deadline in seconds. If None, the instance default is used
+        :return: The monotonic time at which the call expires, or None if there is no deadline
+        """
+        if deadline is None:
+            deadline = self._deadline
+        if deadline is None:
+            return None
+        return time.monotonic() + deadline
+
+    @staticmethod
+    def _remaining(expires_at: Optional[float]) -> Optional[float]:
+        """
+        Get the time left before a deadline
+        :param expires_at: The monotonic time at which the call expires, as returned by _expires_at
+        :return: The remaining time in seconds, or None if there is no deadline
+        """
+        if expires_at is None:
+            return None
+        remaining = expires_at - time.monotonic()
+        if remaining <= 0:
+            raise ShellHubTimeoutError("Deadline exceeded.")
+        return remaining
+
+    def _attempt_timeout(self, timeout: Optional[Timeout], expires_at: Optional[float]) -> Optional[Timeout]:
+        """
+        Compute the timeout of a single HTTP request, clamped so that it never outlives the call deadline
+        """
+        if timeout is None:
+            timeout = self._timeout
+        remaining = self._remaining(expires_at)
+        if remaining is None:
+            return timeout
+        if timeout is None:
+            return remaining
+        if isinstance(timeout, tuple):
+            return min(timeout[0], remaining), min(timeout[1], remaining)
+        return min(timeout, remaining)
+
+    def _login(self, timeout: Optional[Timeout] = None, expires_at: Optional[float] = None) -> None:
         try:
-            response = requests.post(
+            response = self._transport.request(
+                "POST",
                 f"{self._url}/api/login",
                 json={
                     "username": self._username,
                     "password": self._password,
                 },
+                timeout=self._attempt_timeout(timeout, expires_at),
             )
+        except requests.exceptions.Timeout as e:
+            raise ShellHubTimeoutError("Timed out while logging in.") from e
         except requests.exceptions.ConnectionError:
             raise ShellHubBaseException("Incorrect endpoint. Is the server up and running ?")
 
@@ -106,7 +219,18 @@ class ShellHub:
         method: str,
         query_params: Optional[Dict[Any, Any]] = None,
         json: Optional[Dict[Any, Any]] = None,
+        timeout: Optional[Timeout] = None,
+        deadline: Optional[float] = None,
+        hedge: bool = False,
     ) -> requests.Response:
+        """
+        Make an authenticated request to the API, logging in again once if the token expired
+        :param timeout: Timeout of each HTTP request. If None, the instance default is used
+        :param deadline: Overall time budget for the call, login retry included. If None, the instance default is used
+        :param hedge: Whether the request is idempotent and may be hedged (only applies if hedging is enabled)
+        :return: The response of the API
+        """
+        expires_at = self._expires_at(deadline)
         params = ""
         if query_params:
             params = "?"
@@ -114,32 +238,132 @@ class ShellHub:
                 params += f"{key}={value}&"
             params = params[:-1]
 
-        response: requests.Response = getattr(requests, method.lower())(
-            f"{self._url}{endpoint}{params if params else ''}",
-            headers={
-                "Authorization": f"Bearer {self._access_token}",
-            },
-            json=json,
-        )
+        url = f"{self._url}{endpoint}{params if params else ''}"
+
+        response = self._send(method, url, json, timeout, expires_at, hedge)
 
         if response.status_code == 401:
-            self._login()
-            response = getattr(requests, method.lower())(
-                f"{self._url}{endpoint}{params if params else ''}",
+            self._login(timeout, expires_at)
+            response = self._send(method, url, json, timeout, expires_at, hedge)
+            if response.status_code == 401:
+                raise ShellHubApiError(f"Couldn't fix request with a token refresh: {response.text}")
+
+        return response
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        json: Optional[Dict[Any, Any]],
+        timeout: Optional[Timeout],
+        expires_at: Optional[float],
+        hedge: bool,
+    ) -> requests.Response:
+        if hedge and self._hedge_percentile is not None and not self._closed:
+            delay = self._hedge_delay()
+            if delay is not None:
+                return self._send_hedged(delay, method, url, json, timeout, expires_at)
+        return self._send_once(method, url, json, timeout, expires_at)
+
+    def _send_once(
+        self,
+        method: str,
+        url: str,
+        json: Optional[Dict[Any, Any]],
+        timeout: Optional[Timeout],
+        expires_at: Optional[float],
+    ) -> requests.Response:
+        start = time.monotonic()
+        try:
+            response = self._transport.request(
+                method.upper(),
+                url,
                 headers={
                     "Authorization": f"Bearer {self._access_token}",
                 },
                 json=json,
+                timeout=self._attempt_timeout(timeout, expires_at),
             )
-            if response.status_code == 401:
-                raise ShellHubApiError(f"Couldn't fix request with a token refresh: {response.text}")
+        except requests.exceptions.Timeout as e:
+            raise ShellHubTimeoutError(f"Request to {url} timed out.") from e
+        except requests.exceptions.ConnectionError as e:
+            raise ShellHubApiError(f"Couldn't connect to {url}.") from e
 
+        if method.upper() == "GET" and response.ok:
+            self._latencies.append(time.monotonic() - start)
         return response
 
+    def _hedge_delay(self) -> Optional[float]:
+        """
+        Get the latency percentile after which a hedged request is sent
+        :return: The delay in seconds, or None if not enough latencies were observed yet
+        """
+        latencies = sorted(self._latencies)
+        if len(latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        index = round((len(latencies) - 1) * self._hedge_percentile / 100)  # type: ignore
+        return latencies[index]
+
+    def _send_hedged(
+        self,
+        delay: float,
+        method: str,
+        url: str,
+        json: Optional[Dict[Any, Any]],
+        timeout: Optional[Timeout],
+        expires_at: Optional[float],
+    ) -> requests.Response:
+        first = self._start_attempt(method, url, json, timeout, expires_at)
+        done, _ = concurrent.futures.wait([first], timeout=delay)
+        if done:
+            return first.result()
+
+        second = self._start_attempt(method, url, json, timeout, expires_at)
+        pending = {first, second}
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+        # Both attempts failed, surface the error of the original one
+        return first.result()
+
+    def _start_attempt(
+        self,
+        method: str,
+        url: str,
+        json: Optional[Dict[Any, Any]],
+        timeout: Optional[Timeout],
+        expires_at: Optional[float],
+    ) -> "concurrent.futures.Future[requests.Response]":
+        # A thread per attempt rather than a pool: the hedge must never queue behind stalled attempts of concurrent
+        # callers, and the attempt that loses the race must not keep the interpreter alive until its timeout
+        future: "concurrent.futures.Future[requests.Response]" = concurrent.futures.Future()
+
+        def attempt() -> None:
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(self._send_once(method, url, json, timeout, expires_at))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=attempt, name="shellhub-hedge", daemon=True).start()
+        return future
+
     def _get_devices(
-        self, query_params: Optional[Dict[Any, Any]] = None
+        self,
+        query_params: Optional[Dict[Any, Any]] = None,
+        timeout: Optional[Timeout] = None,
+        deadline: Optional[float] = None,
     ) -> "List[shellhub.models.device.ShellHubDevice]":
-        response = self.make_request(endpoint="/api/devices", method="GET", query_params=query_params)
+        response = self.make_request(
+            endpoint="/api/devices",
+            method="GET",
+            query_params=query_params,
+            timeout=timeout,
+            deadline=deadline,
+            hedge=True,
+        )
 
         try:
             response.raise_for_status()
@@ -152,34 +376,111 @@ class ShellHub:
         return devices
 
     def get_all_devices(
-        self, status: Optional[str] = None, query_params: Optional[Dict[Any, Any]] = None
+        self,
+        status: Optional[str] = None,
+        query_params: Optional[Dict[Any, Any]] = None,
+        timeout: Optional[Timeout] = None,
+        deadline: Optional[float] = None,
     ) -> "List[shellhub.models.device.ShellHubDevice]":
         """
         Get all devices from ShellHub. Default gets all devices
+        :param deadline: Overall time budget for fetching every page
+        """
+        return list(self.iter_devices(status=status, query_params=query_params, timeout=timeout, deadline=deadline))
+
+    def iter_devices(
+        self,
+        status: Optional[str] = None,
+        query_params: Optional[Dict[Any, Any]] = None,
+        timeout: Optional[Timeout] = None,
+        deadline: Optional[float] = None,
+        per_page: int = DEFAULT_PAGE_SIZE,
+        workers: int = 1,
+    ) -> "Iterator[shellhub.models.device.ShellHubDevice]":
+        """
+        Iterate over the devices from ShellHub, page by page
+        :param deadline: Overall time budget for fetching every page, starting now
+        :param per_page: Number of devices fetched per request
+        :param workers: Number of pages fetched concurrently ahead of the one being consumed. Devices are still yielded
+            in order, and at most that many pages are held in memory.
         """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        expires_at = self._expires_at(deadline)
         if not query_params:
             query_params = {}
         if status:
             if status not in ["accepted", "rejected", "pending", "removed", "unused"]:
                 raise ValueError("status must be one of accepted, rejected or pending")
             query_params["status"] = status
-        devices = []
+        if workers > 1:
+            return self._iter_pages_concurrently(query_params, timeout, expires_at, per_page, workers)
+        return self._iter_pages(query_params, timeout, expires_at, per_page)
+
+    def _get_page(
+        self,
+        page: int,
+        query_params: Dict[Any, Any],
+        timeout: Optional[Timeout],
+        expires_at: Optional[float],
+        per_page: int,
+    ) -> "List[shellhub.models.device.ShellHubDevice]":
+        return self._get_devices(
+            # Pagination is driven here, it must not be overridden by the caller's query parameters
+            query_params={**query_params, "page": page, "per_page": per_page},
+            timeout=timeout,
+            deadline=self._remaining(expires_at),
+        )
+
+    def _iter_pages(
+        self, query_params: Dict[Any, Any], timeout: Optional[Timeout], expires_at: Optional[float], per_page: int
+    ) -> "Iterator[shellhub.models.device.ShellHubDevice]":
         page = 1
         while True:
-            devices_response = self._get_devices(query_params={"page": page, "per_page": 100, **query_params})
-            devices += devices_response
-            if len(devices_response) < 100:
+            devices_response = self._get_page(page, query_params, timeout, expires_at, per_page)
+            yield from devices_response
+            if len(devices_response) < per_page:
                 break
             page += 1
-        return devices
 
-    def get_device(self, uid: str) -> "shellhub.models.device.ShellHubDevice":
+    def _iter_pages_concurrently(
+        self,
+        query_params: Dict[Any, Any],
+        timeout: Optional[Timeout],
+        expires_at: Optional[float],
+        per_page: int,
+        workers: int,
+    ) -> "Iterator[shellhub.models.device.ShellHubDevice]":
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="shellhub-pages")
+        futures: "Deque[concurrent.futures.Future[List[shellhub.models.device.ShellHubDevice]]]" = deque()
+        try:
+            for page in range(1, workers + 1):
+                futures.append(executor.submit(self._get_page, page, query_params, timeout, expires_at, per_page))
+            next_page = workers + 1
+            while futures:
+                devices_response = futures.popleft().result()
+                yield from devices_response
+                if len(devices_response) < per_page:
+                    # The total is unknown, so the pages already requested past the last one are simply dropped
+                    break
+                futures.append(executor.submit(self._get_page, next_page, query_params, timeout, expires_at, per_page))
+                next_page += 1
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def get_device(
+        self, uid: str, timeout: Optional[Timeout] = None, deadline: Optional[float] = None
+    ) -> "shellhub.models.device.ShellHubDevice":
         """
         Get a device from ShellHub by its UID
         :param uid: The UID of the device
         :return: A ShellHubDevice object
         """
-        response = self.make_request(endpoint=f"/api/devices/{uid}", method="GET")
+        response = self.make_request(
+            endpoint=f"/api/devices/{uid}", method="GET", timeout=timeout, deadline=deadline, hedge=True
+        )
         if response.status_code == 404:
             raise DeviceNotFoundError(f"Device {uid} not found.")
         else:
@@ -189,3 +490,49 @@ class ShellHub:
                 raise ShellHubApiError(e)
             else:
                 return shellhub.models.device.ShellHubDevice(self, response.json())
+
+    def reconcile(
+        self,
+        devices: "List[shellhub.models.device.ShellHubDevice]",
+        timeout: Optional[Timeout] = None,
+        deadline: Optional[float] = None,
+        max_refreshes: int = 10,
+    ) -> "List[shellhub.models.device.ShellHubDevice]":
+        """
+        Confirm the state of optimistically mutated devices. A handful of stale devices are refreshed one by one.
+        Past `max_refreshes`, the device list is paged through once instead, filtered by status when every stale
+        device has the same one, and stops as soon as every stale device has been updated. Pages aren't a snapshot,
+        so the few devices not seen while paging (moved between pages, or whose status differs from the local
+        guess) are then refreshed one by one.
+        :param devices: The devices to reconcile. Devices that aren't stale are left untouched
+        :param deadline: Overall time budget for every request
+        :param max_refreshes: Most stale devices refreshed one by one, rather than by paging the device list
+        :return: The stale devices that don't exist anymore in the API
+        """
+        stale = {device.uid: device for device in devices if device.stale}
+        expires_at = self._expires_at(deadline)
+
+        if len(stale) > max_refreshes:
+            statuses = {device.status for device in stale.values()}
+            query_params: Dict[str, Any] = {"status": statuses.pop()} if len(statuses) == 1 else {}
+            page = 1
+            while stale:
+                devices_response = self._get_devices(
+                    query_params={**query_params, "page": page, "per_page": DEFAULT_PAGE_SIZE},
+                    timeout=timeout,
+                    deadline=self._remaining(expires_at),
+                )
+                for fresh in devices_response:
+                    if fresh.uid in stale:
+                        stale.pop(fresh.uid).__dict__.update(vars(fresh))
+                if len(devices_response) < DEFAULT_PAGE_SIZE:
+                    break
+                page += 1
+
+        missing = []
+        for device in stale.values():
+            try:
+                device.refresh(timeout=timeout, deadline=self._remaining(expires_at))
+            except DeviceNotFoundError:
+                missing.append(device)
+        return missing
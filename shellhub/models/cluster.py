@@ -0,0 +1,196 @@
+import concurrent.futures
+import queue
+import threading
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Union
+
+from shellhub.exceptions import DeviceNotFoundError
+from shellhub.exceptions import ShellHubClusterError
+from shellhub.models.base import ShellHub
+from shellhub.models.device import ShellHubDevice
+from shellhub.transport import Timeout
+
+
+class ShellHubClusterDevice(NamedTuple):
+    instance: str
+    device: ShellHubDevice
+
+
+class ShellHubCluster:
+    """
+    Query several ShellHub instances at once. Every instance is queried concurrently, so a fleet-wide query takes as
+    long as the slowest instance, and a failing instance doesn't prevent the others from answering.
+    """
+
+    _instances: Dict[str, ShellHub]
+
+    def __init__(self, instances: Union[Mapping[str, ShellHub], Iterable[ShellHub]]) -> None:
+        """
+        :param instances: The ShellHub clients, either as a mapping of names to clients, or as an iterable of clients
+            in which case each one is named after its URL. Clients sharing a URL, e.g. for different tenants, must
+            be given as a mapping
+        :raises ValueError: If the cluster is empty, or if several clients would be given the same name
+        """
+        if isinstance(instances, Mapping):
+            self._instances = dict(instances)
+        else:
+            self._instances = {}
+            for instance in instances:
+                name = str(instance)
+                if name in self._instances:
+                    raise ValueError(f"Several instances are named {name}, give them distinct names with a mapping")
+                self._instances[name] = instance
+        if not self._instances:
+            raise ValueError("A cluster needs at least one instance")
+
+    def __repr__(self) -> str:
+        return f"<ShellHubCluster instances={list(self._instances)}>"
+
+    def __len__(self) -> int:
+        return len(self._instances)
+
+    def __getitem__(self, name: str) -> ShellHub:
+        return self._instances[name]
+
+    @property
+    def instances(self) -> Dict[str, ShellHub]:
+        return dict(self._instances)
+
+    def iter_devices(
+        self,
+        status: Optional[str] = None,
+        query_params: Optional[Dict[Any, Any]] = None,
+        timeout: Optional[Timeout] = None,
+        deadline: Optional[float] = None,
+        per_page: int = 100,
+    ) -> Iterator[ShellHubClusterDevice]:
+        """
+        Iterate over the devices of every instance, as soon as their pages arrive. Devices of different instances are
+        interleaved in the order they are received. Each instance is fetched about one page ahead of the caller.
+        :param per_page: Number of devices fetched per request
+        :raises ShellHubClusterError: Once every healthy instance has been exhausted, if some instances failed
+        """
+        # Validate the arguments eagerly, before any thread is started
+        iterators = {
+            name: instance.iter_devices(
+                status=status,
+                query_params=dict(query_params or {}),
+                timeout=timeout,
+                deadline=deadline,
+                per_page=per_page,
+            )
+            for name, instance in self._instances.items()
+        }
+        return self._merge(iterators, per_page)
+
+    def _merge(
+        self, iterators: Dict[str, Iterator[ShellHubDevice]], max_pending: int
+    ) -> Iterator[ShellHubClusterDevice]:
+        # Bounded, so that a worker blocks instead of fetching pages far ahead of the caller
+        results: "queue.Queue[Any]" = queue.Queue(maxsize=max_pending)
+        stop = threading.Event()
+        done = object()
+
+        def put(result: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    results.put(result, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def drain(name: str, iterator: Iterator[ShellHubDevice]) -> None:
+            try:
+                for device in iterator:
+                    if not put(ShellHubClusterDevice(name, device)):
+                        return
+            except Exception as e:
+                put((name, e))
+            finally:
+                put(done)
+
+        errors: Dict[str, Exception] = {}
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=len(iterators), thread_name_prefix="shellhub-cluster"
+        )
+        try:
+            for name, iterator in iterators.items():
+                executor.submit(drain, name, iterator)
+            running = len(iterators)
+            while running:
+                result = results.get()
+                if result is done:
+                    running -= 1
+                elif isinstance(result, ShellHubClusterDevice):
+                    yield result
+                else:
+                    errors[result[0]] = result[1]
+        finally:
+            # Let the workers give up if the caller stopped iterating early
+            stop.set()
+            executor.shutdown(wait=False)
+
+        if errors:
+            raise ShellHubClusterError(errors)
+
+    def get_all_devices(
+        self,
+        status: Optional[str] = None,
+        query_params: Optional[Dict[Any, Any]] = None,
+        timeout: Optional[Timeout] = None,
+        deadline: Optional[float] = None,
+    ) -> List[ShellHubClusterDevice]:
+        """
+        Get all devices of every instance
+        :raises ShellHubClusterError: If some instances failed. The devices of the healthy instances are available in
+            its `devices` attribute
+        """
+        devices: List[ShellHubClusterDevice] = []
+        try:
+            devices.extend(
+                self.iter_devices(status=status, query_params=query_params, timeout=timeout, deadline=deadline)
+            )
+        except ShellHubClusterError as e:
+            raise ShellHubClusterError(e.errors, devices) from None
+        return devices
+
+    def get_device(
+        self, uid: str, timeout: Optional[Timeout] = None, deadline: Optional[float] = None
+    ) -> ShellHubClusterDevice:
+        """
+        Look a device up by its UID on every instance at once
+        :return: The device, tagged with the name of the instance it was found on
+        :raises DeviceNotFoundError: If no instance knows the device
+        :raises ShellHubClusterError: If no healthy instance knows the device, but some instances failed
+        """
+        errors: Dict[str, Exception] = {}
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=len(self._instances), thread_name_prefix="shellhub-cluster"
+        )
+        try:
+            futures = {
+                executor.submit(instance.get_device, uid, timeout=timeout, deadline=deadline): name
+                for name, instance in self._instances.items()
+            }
+            for future in concurrent.futures.as_completed(futures):
+                name = futures[future]
+                try:
+                    return ShellHubClusterDevice(name, future.result())
+                except DeviceNotFoundError:
+                    continue
+                except Exception as e:
+                    errors[name] = e
+        finally:
+            executor.shutdown(wait=False)
+
+        if errors:
+            raise ShellHubClusterError(errors)
+        raise DeviceNotFoundError(f"Device {uid} not found.")
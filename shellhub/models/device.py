@@ -1,28 +1,107 @@
+import sys
+import threading
+import weakref
 from datetime import datetime
+from datetime import timezone
+from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
 
 import requests
 
 import shellhub.models.base
 from shellhub.exceptions import DeviceNotFoundError
 from shellhub.exceptions import ShellHubApiError
+from shellhub.transport import Timeout
 
 
 class ShellHubDeviceInfo:
+    """
+    Immutable description of the OS running on a device. Most devices of a fleet share the exact same info, so
+    instances are pooled: use ShellHubDeviceInfo.shared() to get the instance already in use for the same values.
+    """
+
+    __slots__ = ("id", "pretty_name", "version", "arch", "platform", "_key", "__weakref__")
+
     id: str
     pretty_name: str
     version: str
     arch: str
     platform: str
+    _key: Tuple[str, ...]
+
+    _pool: "weakref.WeakValueDictionary[Tuple[str, ...], ShellHubDeviceInfo]" = weakref.WeakValueDictionary()
+    _pool_lock = threading.Lock()
 
     def __init__(self, device_info_json: Dict[str, str]):
-        self.id = device_info_json["id"]
-        self.pretty_name = device_info_json["pretty_name"]
-        self.version = device_info_json["version"]
-        self.arch = device_info_json["arch"]
-        self.platform = device_info_json["platform"]
+        object.__setattr__(self, "id", sys.intern(device_info_json["id"]))
+        object.__setattr__(self, "pretty_name", sys.intern(device_info_json["pretty_name"]))
+        object.__setattr__(self, "version", sys.intern(device_info_json["version"]))
+        object.__setattr__(self, "arch", sys.intern(device_info_json["arch"]))
+        object.__setattr__(self, "platform", sys.intern(device_info_json["platform"]))
+        object.__setattr__(self, "_key", (self.id, self.pretty_name, self.version, self.arch, self.platform))
+
+    @classmethod
+    def shared(cls, device_info_json: Dict[str, str]) -> "ShellHubDeviceInfo":
+        """
+        Get the pooled ShellHubDeviceInfo for these values, creating it if none is alive
+        :param device_info_json: The info object of a device, as returned by the API
+        :return: A ShellHubDeviceInfo, shared with every other device having the same info
+        """
+        return cls._shared(
+            (
+                device_info_json["id"],
+                device_info_json["pretty_name"],
+                device_info_json["version"],
+                device_info_json["arch"],
+                device_info_json["platform"],
+            )
+        )
+
+    @classmethod
+    def _shared(cls, key: Tuple[str, ...]) -> "ShellHubDeviceInfo":
+        with cls._pool_lock:
+            info = cls._pool.get(key)
+            if info is None:
+                info = cls(dict(zip(("id", "pretty_name", "version", "arch", "platform"), key)))
+                cls._pool[key] = info
+            return info
+
+    def _astuple(self) -> Tuple[str, ...]:
+        # The same tuple is returned every time, so that serializers can deduplicate it
+        return self._key
+
+    def to_dict(self) -> Dict[str, str]:
+        """
+        :return: The info in the format returned by the API
+        """
+        return {
+            "id": self.id,
+            "pretty_name": self.pretty_name,
+            "version": self.version,
+            "arch": self.arch,
+            "platform": self.platform,
+        }
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Unpickled infos go through the pool too, and the default slots pickling would trip on the immutability
+        return type(self).shared, (self.to_dict(),)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ShellHubDeviceInfo):
+            return NotImplemented
+        return self._astuple() == other._astuple()
+
+    def __hash__(self) -> int:
+        return hash(self._astuple())
 
     def __repr__(self) -> str:
         return (
@@ -50,26 +129,130 @@ class ShellHubDevice:
     remote_addr: str
     tags: List[str]
     acceptable: bool
+    _stale: bool
 
-    def __init__(self, api_object: shellhub.models.base.ShellHub, device_json):  # type: ignore
+    def __init__(self, api_object: "shellhub.models.base.ShellHub", device_json):  # type: ignore
         self._api = api_object
+        self._stale = False
 
         self.uid = device_json["uid"]
         self.name = device_json["name"]
         self.mac_address = device_json["identity"]["mac"]
-        self.info = ShellHubDeviceInfo(device_json["info"])
+        self.info = ShellHubDeviceInfo.shared(device_json["info"])
         self.public_key = device_json["public_key"]
-        self.tenant_id = device_json["tenant_id"]
+        # Strings repeated across the whole fleet are interned so every device shares a single copy
+        self.tenant_id = sys.intern(device_json["tenant_id"])
         self.last_seen = self._safe_isoformat_to_datetime(device_json["last_seen"])
         self.online = device_json["online"]
-        self.namespace = device_json["namespace"]
-        self.status = device_json["status"]
+        self.namespace = sys.intern(device_json["namespace"])
+        self.status = sys.intern(device_json["status"])
         self.status_updated_at = self._safe_isoformat_to_datetime(device_json["status_updated_at"])
         self.created_at = self._safe_isoformat_to_datetime(device_json["created_at"])
         self.remote_addr = device_json["remote_addr"]
         self.tags = device_json["tags"]
         self.acceptable = device_json["acceptable"]
 
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize the device in the format returned by the API, so that from_dict() can load it back. Stale devices
+        get an extra "stale" key, so that they are still known to be stale once loaded
+        :return: A JSON serializable dict
+        """
+        device_json: Dict[str, Any] = {
+            "uid": self.uid,
+            "name": self.name,
+            "identity": {"mac": self.mac_address},
+            "info": self.info.to_dict(),
+            "public_key": self.public_key,
+            "tenant_id": self.tenant_id,
+            "last_seen": self.last_seen.isoformat(),
+            "online": self.online,
+            "namespace": self.namespace,
+            "status": self.status,
+            "status_updated_at": self.status_updated_at.isoformat(),
+            "created_at": self.created_at.isoformat(),
+            "remote_addr": self.remote_addr,
+            "tags": list(self.tags),
+            "acceptable": self.acceptable,
+        }
+        if self._stale:
+            device_json["stale"] = True
+        return device_json
+
+    @classmethod
+    def from_dict(cls, api_object: "shellhub.models.base.ShellHub", device_json: Dict[str, Any]) -> "ShellHubDevice":
+        """
+        Load a device serialized with to_dict(), or returned by the API
+        :param api_object: The ShellHub client the device is attached to
+        """
+        device = cls(api_object, device_json)
+        device._stale = device_json.get("stale", False)
+        return device
+
+    def _to_row(self) -> Tuple[Any, ...]:
+        """
+        Compact form of the device, used by the binary serialization. The order matches _from_row()
+        """
+        return (
+            self.uid,
+            self.name,
+            self.mac_address,
+            self.info._astuple(),
+            self.public_key,
+            self.tenant_id,
+            self.last_seen,
+            self.online,
+            self.namespace,
+            self.status,
+            self.status_updated_at,
+            self.created_at,
+            self.remote_addr,
+            self.tags,
+            self.acceptable,
+            self._stale,
+        )
+
+    @classmethod
+    def _from_row(cls, api_object: "shellhub.models.base.ShellHub", row: Tuple[Any, ...]) -> "ShellHubDevice":
+        device = cls.__new__(cls)
+        device._api = api_object
+        (
+            device.uid,
+            device.name,
+            device.mac_address,
+            info,
+            device.public_key,
+            tenant_id,
+            device.last_seen,
+            device.online,
+            namespace,
+            status,
+            device.status_updated_at,
+            device.created_at,
+            device.remote_addr,
+            device.tags,
+            device.acceptable,
+            device._stale,
+        ) = row
+        device.info = ShellHubDeviceInfo._shared(info)
+        device.tenant_id = sys.intern(tenant_id)
+        device.namespace = sys.intern(namespace)
+        device.status = sys.intern(status)
+        return device
+
+    def attach(self, api_object: "shellhub.models.base.ShellHub") -> None:
+        """
+        Attach the device to a ShellHub client, typically after unpickling it in another process
+        :param api_object: The ShellHub client used by the device methods
+        """
+        self._api = api_object
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Never pickle the client: it holds the credentials. The device must be attached again once unpickled
+        state = self.__dict__.copy()
+        state["_api"] = None
+        return state
+
     @staticmethod
     def _safe_isoformat_to_datetime(date_string: str) -> datetime:
         # Replace "Z" with "+00:00" to indicate UTC in a format compatible with Python 3.7-3.10.
@@ -92,12 +275,14 @@ class ShellHubDevice:
                 # depending on your input formats.
                 raise ShellHubApiError(f"Invalid date string: {date_string} (Couldn't convert to datetime)") from e
 
-    def delete(self) -> bool:
+    def delete(self, timeout: Optional[Timeout] = None, deadline: Optional[float] = None) -> bool:
         """
         Delete the device from the API
         :return: True if the device was deleted, False otherwise
         """
-        response = self._api.make_request(endpoint=f"/api/devices/{self.uid}", method="DELETE")
+        response = self._api.make_request(
+            endpoint=f"/api/devices/{self.uid}", method="DELETE", timeout=timeout, deadline=deadline
+        )
         if response.status_code == 200:
             return True
         elif response.status_code == 404:
@@ -110,15 +295,24 @@ class ShellHubDevice:
             else:
                 return False
 
-    def rename(self, name: Optional[str] = None) -> bool:
+    def rename(
+        self,
+        name: Optional[str] = None,
+        timeout: Optional[Timeout] = None,
+        deadline: Optional[float] = None,
+    ) -> bool:
         """
         Set a new name for the device. If no name is provided, the name will be the mac address of the device
         """
         if not name:
             name = self.mac_address.replace(":", "-")
-        response = self._api.make_request(endpoint=f"/api/devices/{self.uid}", method="PUT", json={"name": name})
+        response = self._api.make_request(
+            endpoint=f"/api/devices/{self.uid}", method="PUT", json={"name": name}, timeout=timeout, deadline=deadline
+        )
         if response.status_code == 200:
             self.name = name
+            if self._api._optimistic_mutations:
+                self._stale = True
             return True
         elif response.status_code == 404:
             raise DeviceNotFoundError(f"Device {self.uid} not found.")
@@ -132,17 +326,31 @@ class ShellHubDevice:
             else:
                 return False
 
-    def accept(self) -> bool:
+    def accept(self, timeout: Optional[Timeout] = None, deadline: Optional[float] = None) -> bool:
         """
-        Accept the device if it is pending
+        Accept the device if it is pending. With optimistic mutations, the device is updated locally instead of being
+        refreshed, and is left stale until ShellHub.reconcile() confirms it
+        :param deadline: Overall time budget, including the refresh that follows the acceptation
         :return: True if the device was accepted, False otherwise
         """
         if self.status != "pending":
             raise ShellHubApiError(f"Device {self.uid} is not pending.")
 
-        response = self._api.make_request(endpoint=f"/api/devices/{self.uid}/accept", method="PATCH")
+        expires_at = self._api._expires_at(deadline)
+        response = self._api.make_request(
+            endpoint=f"/api/devices/{self.uid}/accept",
+            method="PATCH",
+            timeout=timeout,
+            deadline=self._api._remaining(expires_at),
+        )
         if response.status_code == 200:
-            self.refresh()
+            if self._api._optimistic_mutations:
+                self.status = "accepted"
+                self.status_updated_at = datetime.now(timezone.utc)
+                self.acceptable = False
+                self._stale = True
+            else:
+                self.refresh(timeout=timeout, deadline=self._api._remaining(expires_at))
             return True
         elif response.status_code == 404:
             raise DeviceNotFoundError(f"Device {self.uid} not found.")
@@ -154,12 +362,14 @@ class ShellHubDevice:
             else:
                 return False
 
-    def refresh(self) -> None:
+    def refresh(self, timeout: Optional[Timeout] = None, deadline: Optional[float] = None) -> None:
         """
         Refresh the device information from the API
         :return: None
         """
-        response = self._api.make_request(endpoint=f"/api/devices/{self.uid}", method="GET")
+        response = self._api.make_request(
+            endpoint=f"/api/devices/{self.uid}", method="GET", timeout=timeout, deadline=deadline, hedge=True
+        )
         if response.status_code == 404:
             raise DeviceNotFoundError(f"Device {self.uid} not found.")
         elif response.status_code == 200:
@@ -170,6 +380,14 @@ class ShellHubDevice:
             except requests.exceptions.HTTPError as e:
                 raise ShellHubApiError(e)
 
+    @property
+    def stale(self) -> bool:
+        """
+        Whether the device was optimistically mutated and not yet confirmed by the API
+        :return: True if the device state is a local guess, False if it comes from the API
+        """
+        return self._stale
+
     @property
     def sshid(self) -> Optional[str]:
         """
@@ -0,0 +1,110 @@
+"""
+Serialization of device lists, to share them between processes or cache them without fetching them again.
+
+Two formats are supported:
+- "binary": a compact pickle of plain tuples, loaded with an unpickler that only accepts datetimes. It is the fastest
+  but is only meant to be read back by this module.
+- "ndjson": one device per line, in the format returned by the API. It is portable and can be streamed.
+
+The ShellHub client is never serialized, since it holds the credentials: loaded devices are attached to the client
+given to the load functions.
+"""
+
+import contextlib
+import gc
+import io
+import json
+import pickle
+from typing import Any
+from typing import BinaryIO
+from typing import Iterable
+from typing import Iterator
+from typing import List
+
+from shellhub.exceptions import ShellHubBaseException
+from shellhub.models.base import ShellHub
+from shellhub.models.device import ShellHubDevice
+
+FORMATS = ("binary", "ndjson")
+
+_BINARY_MAGIC = b"SHD\x01"
+
+
+class _DeviceUnpickler(pickle.Unpickler):
+    _allowed = {("datetime", "datetime"), ("datetime", "timezone"), ("datetime", "timedelta")}
+
+    def find_class(self, module: str, name: str) -> Any:
+        if (module, name) not in self._allowed:
+            raise pickle.UnpicklingError(f"Forbidden global {module}.{name}")
+        return super().find_class(module, name)
+
+
+@contextlib.contextmanager
+def _gc_paused() -> Iterator[None]:
+    """
+    Loading a fleet allocates millions of objects that all stay alive, which makes the garbage collector run over and
+    over for nothing. Pause it for the duration.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _check_format(format: str) -> None:
+    if format not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+
+
+def dump_devices(devices: Iterable[ShellHubDevice], fp: BinaryIO, format: str = "binary") -> None:
+    """
+    Write devices to a binary file
+    :param devices: The devices to serialize. With the ndjson format, they are written as they are iterated
+    :param fp: A file opened in binary mode
+    :param format: One of "binary" or "ndjson"
+    """
+    _check_format(format)
+    if format == "binary":
+        fp.write(_BINARY_MAGIC)
+        pickle.dump([device._to_row() for device in devices], fp, protocol=4)
+    else:
+        for device in devices:
+            fp.write(json.dumps(device.to_dict(), separators=(",", ":")).encode())
+            fp.write(b"\n")
+
+
+def load_devices(fp: BinaryIO, api_object: ShellHub, format: str = "binary") -> List[ShellHubDevice]:
+    """
+    Read devices written by dump_devices()
+    :param fp: A file opened in binary mode
+    :param api_object: The ShellHub client to attach the devices to
+    :param format: The format used to write them, "binary" or "ndjson"
+    """
+    _check_format(format)
+    if format == "binary":
+        if fp.read(len(_BINARY_MAGIC)) != _BINARY_MAGIC:
+            raise ShellHubBaseException("Not a serialized device list.")
+        with _gc_paused():
+            rows = _DeviceUnpickler(fp).load()
+            return [ShellHubDevice._from_row(api_object, row) for row in rows]
+    with _gc_paused():
+        return [ShellHubDevice.from_dict(api_object, json.loads(line)) for line in fp if line.strip()]
+
+
+def dumps_devices(devices: Iterable[ShellHubDevice], format: str = "binary") -> bytes:
+    """
+    Same as dump_devices(), but returns the serialized devices
+    """
+    buffer = io.BytesIO()
+    dump_devices(devices, buffer, format)
+    return buffer.getvalue()
+
+
+def loads_devices(data: bytes, api_object: ShellHub, format: str = "binary") -> List[ShellHubDevice]:
+    """
+    Same as load_devices(), but reads the devices from bytes
+    """
+    return load_devices(io.BytesIO(data), api_object, format)
@@ -0,0 +1,245 @@
+"""
+In-memory stand-in for a ShellHub server, to drive the SDK without any network.
+
+    simulator = ShellHubSimulator(users={"john.doe": "dolphin"})
+    simulator.add_device(uid="1", name="default", status="pending")
+    api = ShellHub("john.doe", "dolphin", "http://shellhub.local", transport=simulator)
+"""
+
+import json
+import re
+import threading
+import time
+import uuid
+from datetime import datetime
+from datetime import timezone
+from http import HTTPStatus
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from urllib.parse import parse_qs
+from urllib.parse import urlsplit
+
+import requests
+
+from shellhub.transport import Timeout
+from shellhub.transport import Transport
+
+_DEVICE_PATH = re.compile(r"^/api/devices/(?P<uid>[^/]+)$")
+_ACCEPT_PATH = re.compile(r"^/api/devices/(?P<uid>[^/]+)/accept$")
+
+
+class ShellHubSimulator(Transport):
+    """
+    Transport answering like a ShellHub server, from devices kept in memory. It implements the login, the paginated
+    and filtered device list, and getting, renaming, accepting and deleting a device. Tokens expire after
+    `token_ttl` seconds, or on demand with expire_tokens().
+    """
+
+    def __init__(
+        self,
+        users: Optional[Dict[str, str]] = None,
+        token_ttl: float = 3600,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        :param users: Usernames mapped to their password. Defaults to a single "admin" user with "admin" as password
+        :param token_ttl: Lifetime of the tokens, in seconds
+        :param clock: Source of time for the token expiry, replaceable to expire tokens in tests
+        """
+        self.users = users if users is not None else {"admin": "admin"}
+        self.token_ttl = token_ttl
+        self.clock = clock
+        # Devices must be changed through the simulator, so that its indexes stay in sync
+        self.devices: Dict[str, Dict[str, Any]] = {}
+        self.request_count = 0
+        self._tokens: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        # (tenant_id, name) -> uid, to detect conflicting names without scanning the whole fleet
+        self._names: Dict[Tuple[str, str], str] = {}
+        # Device lists by status filter, rebuilt only after a device was added, changed or removed
+        self._listings: Dict[Optional[str], List[Dict[str, Any]]] = {}
+
+    def add_device(self, uid: Optional[str] = None, **fields: Any) -> Dict[str, Any]:
+        """
+        Add a device to the simulated server
+        :param uid: The UID of the device, generated if None
+        :param fields: Fields of the device, in the API format, overriding the defaults
+        :return: The device, as stored by the simulator
+        """
+        uid = uid if uid is not None else uuid.uuid4().hex
+        now = self._now()
+        device: Dict[str, Any] = {
+            "uid": uid,
+            "name": f"device-{uid[:8]}",
+            "identity": {"mac": "00:00:00:00:00:00"},
+            "info": {
+                "id": "ubuntu",
+                "pretty_name": "Ubuntu 22.04 LTS",
+                "version": "v0.14.1",
+                "arch": "amd64",
+                "platform": "docker",
+            },
+            "public_key": "",
+            "tenant_id": "00000000-0000-4000-0000-000000000000",
+            "last_seen": now,
+            "online": True,
+            "namespace": "dev",
+            "status": "pending",
+            "status_updated_at": now,
+            "created_at": now,
+            "remote_addr": "127.0.0.1",
+            "position": {"latitude": 0, "longitude": 0},
+            "tags": [],
+            "public_url": False,
+            "public_url_address": "",
+        }
+        device.update(fields)
+        device["acceptable"] = fields.get("acceptable", device["status"] == "pending")
+        with self._lock:
+            self._remove(uid)
+            self.devices[uid] = device
+            self._names[(device["tenant_id"], device["name"])] = uid
+            self._listings.clear()
+        return device
+
+    def _remove(self, uid: str) -> Optional[Dict[str, Any]]:
+        device = self.devices.pop(uid, None)
+        if device is not None:
+            self._names.pop((device["tenant_id"], device["name"]), None)
+            self._listings.clear()
+        return device
+
+    def expire_tokens(self) -> None:
+        """
+        Invalidate every token handed out so far, like the server does when they expire
+        """
+        with self._lock:
+            self._tokens.clear()
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        json: Optional[Dict[Any, Any]] = None,
+        timeout: Optional[Timeout] = None,
+    ) -> requests.Response:
+        split_url = urlsplit(url)
+        query = {key: values[-1] for key, values in parse_qs(split_url.query).items()}
+        with self._lock:
+            self.request_count += 1
+            status_code, body = self._handle(method.upper(), split_url.path, query, headers or {}, json)
+            # Encode while holding the lock, the body may be a device another thread is about to change
+            return self._response(url, status_code, body)
+
+    def _handle(
+        self, method: str, path: str, query: Dict[str, str], headers: Dict[str, str], body: Optional[Dict[Any, Any]]
+    ) -> Tuple[int, Any]:
+        if method == "POST" and path == "/api/login":
+            return self._login(body or {})
+
+        if not self._is_authenticated(headers):
+            return 401, {"message": "Unauthorized"}
+
+        if path == "/api/devices" and method == "GET":
+            return self._list_devices(query)
+        match = _ACCEPT_PATH.match(path)
+        if match and method == "PATCH":
+            return self._accept_device(match["uid"])
+        match = _DEVICE_PATH.match(path)
+        if match:
+            uid = match["uid"]
+            if method == "GET":
+                return self._get_device(uid)
+            if method == "PUT":
+                return self._rename_device(uid, (body or {}).get("name"))
+            if method == "DELETE":
+                return self._delete_device(uid)
+        return 404, {"message": "Not Found"}
+
+    def _login(self, body: Dict[str, Any]) -> Tuple[int, Any]:
+        username = body.get("username")
+        if username not in self.users or self.users[username] != body.get("password"):
+            return 401, {"message": "Unauthorized"}
+        token = uuid.uuid4().hex
+        self._tokens[token] = self.clock() + self.token_ttl
+        return 200, {"token": token, "user": username, "name": username, "tenant": ""}
+
+    def _is_authenticated(self, headers: Dict[str, str]) -> bool:
+        scheme, _, token = headers.get("Authorization", "").partition(" ")
+        if scheme != "Bearer":
+            return False
+        expires_at = self._tokens.get(token)
+        return expires_at is not None and self.clock() < expires_at
+
+    def _list_devices(self, query: Dict[str, str]) -> Tuple[int, Any]:
+        try:
+            page = int(query.get("page", 1))
+            per_page = int(query.get("per_page", 10))
+        except ValueError:
+            return 400, {"message": "Bad Request"}
+        if page < 1 or per_page < 1:
+            return 400, {"message": "Bad Request"}
+
+        status = query.get("status") or None
+        devices = self._listings.get(status)
+        if devices is None:
+            devices = [device for device in self.devices.values() if status is None or device["status"] == status]
+            self._listings[status] = devices
+        start = (page - 1) * per_page
+        end = start + per_page
+        return 200, devices[start:end]
+
+    def _get_device(self, uid: str) -> Tuple[int, Any]:
+        if uid not in self.devices:
+            return 404, {"message": "Not Found"}
+        return 200, self.devices[uid]
+
+    def _rename_device(self, uid: str, name: Optional[str]) -> Tuple[int, Any]:
+        if uid not in self.devices:
+            return 404, {"message": "Not Found"}
+        if not name:
+            return 400, {"message": "Bad Request"}
+        device = self.devices[uid]
+        if self._names.get((device["tenant_id"], name), uid) != uid:
+            return 409, {"message": "Conflict"}
+        del self._names[(device["tenant_id"], device["name"])]
+        self._names[(device["tenant_id"], name)] = uid
+        device["name"] = name
+        return 200, None
+
+    def _accept_device(self, uid: str) -> Tuple[int, Any]:
+        if uid not in self.devices:
+            return 404, {"message": "Not Found"}
+        device = self.devices[uid]
+        if device["status"] == "accepted":
+            return 400, {"message": "Bad Request"}
+        device["status"] = "accepted"
+        device["status_updated_at"] = self._now()
+        device["acceptable"] = False
+        self._listings.clear()
+        return 200, None
+
+    def _delete_device(self, uid: str) -> Tuple[int, Any]:
+        if self._remove(uid) is None:
+            return 404, {"message": "Not Found"}
+        return 200, None
+
+    @staticmethod
+    def _response(url: str, status_code: int, body: Any) -> requests.Response:
+        response = requests.Response()
+        response.url = url
+        response.status_code = status_code
+        response.reason = HTTPStatus(status_code).phrase
+        response.headers["Content-Type"] = "application/json"
+        response._content = json.dumps(body).encode() if body is not None else b""
+        response.encoding = "utf-8"
+        return response
@@ -0,0 +1,54 @@
+import abc
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+import requests
+
+# A timeout is either a single value in seconds, or a (connect, read) tuple, exactly like `requests` expects it
+Timeout = Union[float, Tuple[float, float]]
+
+
+class Transport(abc.ABC):
+    """
+    Sends the HTTP requests of a ShellHub client. Implementations must be thread safe, and report failures the same
+    way `requests` does: by returning the error response, or by raising requests.exceptions.Timeout and
+    requests.exceptions.ConnectionError.
+    """
+
+    @abc.abstractmethod
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        json: Optional[Dict[Any, Any]] = None,
+        timeout: Optional[Timeout] = None,
+    ) -> requests.Response:
+        raise NotImplementedError
+
+
+class RequestsTransport(Transport):
+    """
+    Default transport, going over HTTP with `requests`
+    """
+
+    def __init__(self, session: Optional[requests.Session] = None) -> None:
+        """
+        :param session: A session to reuse connections with. If None, each request opens its own connection
+        """
+        self._session = session
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        json: Optional[Dict[Any, Any]] = None,
+        timeout: Optional[Timeout] = None,
+    ) -> requests.Response:
+        if self._session is not None:
+            return self._session.request(method, url, headers=headers, json=json, timeout=timeout)
+        return requests.request(method, url, headers=headers, json=json, timeout=timeout)
@@ -0,0 +1,61 @@
+"""
+Stand-in for the ssh client: instead of connecting to the destination, runs the command locally with `sh`, exposing
+the destination and the ssh options to it as environment variables.
+
+Multiplexing is simulated with plain files: with ControlMaster=auto and a ControlPath, the first command creates the
+control "socket" and later ones reuse it, which is exposed as SSH_MASTER=new or SSH_MASTER=reused. `-O exit` removes
+it, and logs its path to the file named by the FAKE_SSH_LOG environment variable, if any.
+"""
+
+import hashlib
+import os
+import subprocess
+import sys
+
+OPTIONS_WITH_VALUE = {"-o", "-p", "-i", "-l", "-F", "-O"}
+
+
+def main(arguments):
+    options = []
+    ssh_options = {}
+    control_command = None
+    index = 0
+    while arguments[index].startswith("-"):
+        if arguments[index] in OPTIONS_WITH_VALUE:
+            value = arguments[index + 1]
+            options.append(f"{arguments[index]} {value}")
+            if arguments[index] == "-o":
+                key, _, option_value = value.partition("=")
+                ssh_options[key] = option_value
+            elif arguments[index] == "-O":
+                control_command = value
+            index += 2
+        else:
+            options.append(arguments[index])
+            index += 1
+    destination = arguments[index]
+    control_path = ssh_options.get("ControlPath", "none")
+    control_path = control_path.replace("%C", hashlib.sha1(destination.encode()).hexdigest())
+
+    if control_command == "exit":
+        if not os.path.exists(control_path):
+            print(f"Control socket connect({control_path}): No such file or directory", file=sys.stderr)
+            return 255
+        os.remove(control_path)
+        if "FAKE_SSH_LOG" in os.environ:
+            with open(os.environ["FAKE_SSH_LOG"], "a") as log:
+                log.write(f"exit {control_path}\n")
+        return 0
+
+    master = "none"
+    if ssh_options.get("ControlMaster") == "auto" and control_path != "none":
+        master = "reused" if os.path.exists(control_path) else "new"
+        open(control_path, "a").close()
+
+    command = " ".join(arguments[index:][1:])
+    env = {**os.environ, "SSH_DESTINATION": destination, "SSH_OPTIONS": "\n".join(options), "SSH_MASTER": master}
+    return subprocess.call(["sh", "-c", command], env=env)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,8 +1,14 @@
+import threading
+import time
+
 import pytest
+import requests
 
 from shellhub import ShellHub
 from shellhub import ShellHubAuthenticationError
 from shellhub import ShellHubBaseException
+from shellhub import ShellHubTimeoutError
+from shellhub.models.base import DEFAULT_TIMEOUT
 from tests.utils import MOCKED_DOMAIN_URL
 
 
@@ -53,3 +59,133 @@ def test_is_valid_url(shellhub):
     assert shellhub._is_valid_url("http://www.example.com")
     assert shellhub._is_valid_url("www.example.com") is False
     assert shellhub._is_valid_url("invalid_url") is False
+
+
+class TestTimeouts:
+    def test_default_timeout(self, shellhub, requests_mock):
+        requests_mock.get(f"{MOCKED_DOMAIN_URL}/api/devices", json=[])
+        shellhub.get_all_devices()
+        assert requests_mock.last_request.timeout == DEFAULT_TIMEOUT
+
+    def test_per_call_timeout(self, shellhub, requests_mock):
+        requests_mock.get(f"{MOCKED_DOMAIN_URL}/api/devices", json=[])
+        shellhub.get_all_devices(timeout=(1, 2))
+        assert requests_mock.last_request.timeout == (1, 2)
+
+    def test_timeout_clamped_by_deadline(self, shellhub, requests_mock):
+        requests_mock.get(f"{MOCKED_DOMAIN_URL}/api/devices", json=[])
+        shellhub.get_all_devices(deadline=5)
+        connect, read = requests_mock.last_request.timeout
+        assert 0 < connect <= 5
+        assert 0 < read <= 5
+
+    def test_timeout_raises(self, shellhub, requests_mock):
+        requests_mock.get(f"{MOCKED_DOMAIN_URL}/api/devices", exc=requests.exceptions.ReadTimeout)
+        with pytest.raises(ShellHubTimeoutError):
+            shellhub.get_all_devices()
+
+    def test_login_timeout_raises(self, requests_mock):
+        requests_mock.post(f"{MOCKED_DOMAIN_URL}/api/login", exc=requests.exceptions.ConnectTimeout)
+        with pytest.raises(ShellHubTimeoutError):
+            ShellHub(username="john.doe", password="dolphin", endpoint_or_url=MOCKED_DOMAIN_URL)
+
+    def test_deadline_exceeded(self, shellhub, requests_mock):
+        def slow_login(request, context):
+            time.sleep(0.05)
+            return {"token": "jwt_token"}
+
+        # The token refresh eats the whole budget, so the retried request must not be sent
+        requests_mock.delete(f"{MOCKED_DOMAIN_URL}/api/devices/1", status_code=401)
+        requests_mock.post(f"{MOCKED_DOMAIN_URL}/api/login", json=slow_login)
+        with pytest.raises(ShellHubTimeoutError):
+            shellhub.make_request("/api/devices/1", "DELETE", deadline=0.01)
+
+
+class TestHedging:
+    def test_invalid_percentile(self, requests_mock):
+        with pytest.raises(ValueError):
+            ShellHub(username="john.doe", password="dolphin", endpoint_or_url=MOCKED_DOMAIN_URL, hedge_percentile=100)
+
+    def test_no_hedge_without_samples(self, shellhub, requests_mock):
+        shellhub._hedge_percentile = 50
+        requests_mock.get(f"{MOCKED_DOMAIN_URL}/api/devices", json=[])
+        shellhub.get_all_devices()
+        assert requests_mock.call_count == 1
+
+    def test_hedged_request_wins(self, shellhub, monkeypatch):
+        shellhub._hedge_percentile = 50
+        shellhub._latencies.extend([0.01] * 20)
+        calls = []
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"[]"
+
+        def first_one_stalls(*args):
+            calls.append(args)
+            if len(calls) == 1:
+                time.sleep(1)
+            return response
+
+        monkeypatch.setattr(shellhub, "_send_once", first_one_stalls)
+        start = time.monotonic()
+        assert shellhub.get_all_devices() == []
+        assert time.monotonic() - start < 1
+        assert len(calls) == 2
+        # The stalled attempt must not keep the interpreter alive
+        assert all(thread.daemon for thread in threading.enumerate() if thread.name == "shellhub-hedge")
+
+    def test_hedges_not_queued_behind_stalls(self, shellhub, monkeypatch):
+        shellhub._hedge_percentile = 50
+        shellhub._latencies.extend([0.01] * 20)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"[]"
+        stalled_urls = set()
+        lock = threading.Lock()
+
+        def first_attempts_stall(method, url, *args):
+            # The first attempt of every caller stalls, every hedge answers at once
+            with lock:
+                stall = url not in stalled_urls
+                stalled_urls.add(url)
+            if stall:
+                time.sleep(1)
+            return response
+
+        monkeypatch.setattr(shellhub, "_send_once", first_attempts_stall)
+        threads = [
+            threading.Thread(target=shellhub.make_request, args=(f"/api/devices/{uid}", "GET"), kwargs={"hedge": True})
+            for uid in range(16)
+        ]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert time.monotonic() - start < 1
+        assert len(stalled_urls) == 16
+
+    def test_no_hedge_once_closed(self, shellhub, monkeypatch):
+        shellhub._hedge_percentile = 50
+        shellhub._latencies.extend([0.0] * 20)
+        calls = []
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"[]"
+
+        def send_once(*args):
+            calls.append(threading.current_thread())
+            return response
+
+        monkeypatch.setattr(shellhub, "_send_once", send_once)
+        with shellhub as api:
+            assert api is shellhub
+        shellhub.get_all_devices()
+        assert calls == [threading.current_thread()]
+
+    def test_mutations_are_not_hedged(self, shellhub, requests_mock):
+        shellhub._hedge_percentile = 50
+        shellhub._latencies.extend([0.0] * 20)
+        requests_mock.delete(f"{MOCKED_DOMAIN_URL}/api/devices/1", status_code=200)
+        shellhub.make_request("/api/devices/1", "DELETE")
+        assert requests_mock.call_count == 1
@@ -0,0 +1,95 @@
+import csv
+import io
+import json
+
+import pytest
+import requests
+
+from shellhub.cli import main
+from tests.utils import make_device_json
+from tests.utils import MOCKED_DOMAIN_URL
+
+CREDENTIALS = ["--url", MOCKED_DOMAIN_URL, "--username", "john.doe", "--password", "dolphin"]
+
+
+@pytest.fixture(scope="function")
+def mocked_api(requests_mock):
+    requests_mock.post(f"{MOCKED_DOMAIN_URL}/api/login", json={"token": "jwt_token"})
+
+    def devices_page(request, context):
+        page = int(request.qs["page"][0])
+        per_page = int(request.qs["per_page"][0])
+        uids = range((page - 1) * per_page, min(page * per_page, 5))
+        return [make_device_json(str(uid), name=f"device-{uid}") for uid in uids]
+
+    requests_mock.get(f"{MOCKED_DOMAIN_URL}/api/devices", json=devices_page)
+    return requests_mock
+
+
+def test_export_ndjson(mocked_api, capsys):
+    assert main(CREDENTIALS + ["export", "--per-page", "2"]) == 0
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["uid"] for line in lines] == ["0", "1", "2", "3", "4"]
+    assert json.loads(lines[0])["identity"] == {"mac": "06:04:ju:le:s7:08"}
+    assert json.loads(lines[0])["last_seen"] == "1970-01-01T00:00:00+00:00"
+
+
+def test_export_ndjson_fields(mocked_api, capsys):
+    assert main(CREDENTIALS + ["export", "--fields", "uid,info.arch,sshid"]) == 0
+
+    line = capsys.readouterr().out.splitlines()[0]
+    assert json.loads(line) == {"uid": "0", "info.arch": "amd64", "sshid": "dev.device-0@shellhub.example.org"}
+
+
+def test_export_csv(mocked_api, tmp_path):
+    output = tmp_path / "devices.csv"
+    assert main(CREDENTIALS + ["export", "--format", "csv", "--fields", "uid,name,online", "-o", str(output)]) == 0
+
+    rows = list(csv.reader(io.StringIO(output.read_text())))
+    assert rows[0] == ["uid", "name", "online"]
+    assert rows[1:] == [[str(uid), f"device-{uid}", "True"] for uid in range(5)]
+
+
+def test_export_single_worker(mocked_api, capsys):
+    assert main(CREDENTIALS + ["export", "--per-page", "2", "--workers", "1"]) == 0
+    assert len(capsys.readouterr().out.splitlines()) == 5
+
+
+def test_export_status_and_query(mocked_api, capsys):
+    assert main(CREDENTIALS + ["export", "--status", "pending", "--query", "sort_by=name", "--workers", "1"]) == 0
+
+    request = mocked_api.last_request
+    assert request.qs["status"] == ["pending"]
+    assert request.qs["sort_by"] == ["name"]
+
+
+@pytest.mark.parametrize("query", ["page=2", "per_page=1000"])
+def test_pagination_query(mocked_api, query):
+    with pytest.raises(SystemExit):
+        main(CREDENTIALS + ["export", "--query", query])
+
+
+def test_unknown_field(mocked_api):
+    with pytest.raises(SystemExit):
+        main(CREDENTIALS + ["export", "--fields", "uid,unknown"])
+
+
+def test_missing_credentials(monkeypatch):
+    monkeypatch.delenv("SHELLHUB_URL", raising=False)
+    with pytest.raises(SystemExit):
+        main(["export"])
+
+
+def test_api_error(mocked_api, capsys):
+    mocked_api.get(f"{MOCKED_DOMAIN_URL}/api/devices", status_code=500)
+
+    assert main(CREDENTIALS + ["export"]) == 1
+    assert "shellhub: error:" in capsys.readouterr().err
+
+
+def test_connection_error(mocked_api, capsys):
+    mocked_api.get(f"{MOCKED_DOMAIN_URL}/api/devices", exc=requests.exceptions.ConnectionError)
+
+    assert main(CREDENTIALS + ["export"]) == 1
+    assert "shellhub: error: Couldn't connect" in capsys.readouterr().err
@@ -0,0 +1,135 @@
+import threading
+import time
+
+import pytest
+
+from shellhub import DeviceNotFoundError
+from shellhub import ShellHub
+from shellhub import ShellHubCluster
+from shellhub import ShellHubClusterError
+from shellhub import ShellHubSimulator
+from tests.utils import make_device_json
+from tests.utils import MOCKED_DOMAIN_URL
+from tests.utils import OTHER_MOCKED_DOMAIN_URL
+
+
+@pytest.fixture(scope="function")
+def shellhub_cluster(requests_mock):
+    instances = {}
+    for name, url in (("eu", MOCKED_DOMAIN_URL), ("us", OTHER_MOCKED_DOMAIN_URL)):
+        requests_mock.post(f"{url}/api/login", json={"token": "jwt_token"})
+        instances[name] = ShellHub(username="john.doe", password="dolphin", endpoint_or_url=url)
+    return ShellHubCluster(instances)
+
+
+def test_repr(shellhub_cluster):
+    assert repr(shellhub_cluster) == "<ShellHubCluster instances=['eu', 'us']>"
+
+
+def test_named_after_url(shellhub):
+    cluster = ShellHubCluster([shellhub])
+    assert cluster[MOCKED_DOMAIN_URL] is shellhub
+
+
+def test_same_url(requests_mock):
+    requests_mock.post(f"{MOCKED_DOMAIN_URL}/api/login", json={"token": "jwt_token"})
+    tenants = [
+        ShellHub(username=username, password="dolphin", endpoint_or_url=MOCKED_DOMAIN_URL)
+        for username in ("john.doe", "jane.doe")
+    ]
+
+    with pytest.raises(ValueError):
+        ShellHubCluster(tenants)
+    assert len(ShellHubCluster({"john": tenants[0], "jane": tenants[1]})) == 2
+
+
+def test_empty_cluster():
+    with pytest.raises(ValueError):
+        ShellHubCluster([])
+
+
+class TestGetAllDevices:
+    def test_merged_and_tagged(self, shellhub_cluster, requests_mock):
+        requests_mock.get(f"{MOCKED_DOMAIN_URL}/api/devices", json=[make_device_json("1"), make_device_json("2")])
+        requests_mock.get(f"{OTHER_MOCKED_DOMAIN_URL}/api/devices", json=[make_device_json("3")])
+
+        devices = shellhub_cluster.get_all_devices()
+
+        assert sorted((instance, device.uid) for instance, device in devices) == [("eu", "1"), ("eu", "2"), ("us", "3")]
+        for instance, device in devices:
+            assert device._api is shellhub_cluster[instance]
+
+    def test_failing_instance(self, shellhub_cluster, requests_mock):
+        requests_mock.get(f"{MOCKED_DOMAIN_URL}/api/devices", status_code=500)
+        requests_mock.get(f"{OTHER_MOCKED_DOMAIN_URL}/api/devices", json=[make_device_json("3")])
+
+        with pytest.raises(ShellHubClusterError) as e:
+            shellhub_cluster.get_all_devices()
+
+        assert list(e.value.errors) == ["eu"]
+        assert [(instance, device.uid) for instance, device in e.value.devices] == [("us", "3")]
+
+    def test_incorrect_status(self, shellhub_cluster):
+        with pytest.raises(ValueError):
+            shellhub_cluster.get_all_devices(status="incorrect_status")
+
+    def test_status_forwarded(self, shellhub_cluster, requests_mock):
+        requests_mock.get(f"{MOCKED_DOMAIN_URL}/api/devices", json=[])
+        requests_mock.get(f"{OTHER_MOCKED_DOMAIN_URL}/api/devices", json=[])
+
+        shellhub_cluster.get_all_devices(status="pending")
+
+        assert all(request.qs.get("status") == ["pending"] for request in requests_mock.request_history[2:])
+
+
+class TestIterDevices:
+    def test_stop_early(self):
+        simulators = {}
+        instances = {}
+        for name in ("eu", "us"):
+            simulators[name] = ShellHubSimulator(users={"john.doe": "dolphin"})
+            for uid in range(1000):
+                simulators[name].add_device(uid=f"{name}-{uid}")
+            instances[name] = ShellHub("john.doe", "dolphin", f"{name}.shellhub.local", transport=simulators[name])
+        cluster = ShellHubCluster(instances)
+
+        iterator = cluster.iter_devices(per_page=10)
+        next(iterator)
+        iterator.close()
+
+        deadline = time.monotonic() + 5
+        while any(thread.name.startswith("shellhub-cluster") for thread in threading.enumerate()):
+            assert time.monotonic() < deadline, "the workers didn't exit"
+            time.sleep(0.01)
+        request_counts = [simulator.request_count for simulator in simulators.values()]
+        time.sleep(0.2)
+        assert [simulator.request_count for simulator in simulators.values()] == request_counts
+        # The login, the page being consumed and at most the next one, out of the 100 pages of each instance
+        assert all(count <= 3 for count in request_counts)
+
+
+class TestGetDevice:
+    def test_found_on_one_instance(self, shellhub_cluster, requests_mock):
+        requests_mock.get(f"{MOCKED_DOMAIN_URL}/api/devices/3", status_code=404)
+        requests_mock.get(f"{OTHER_MOCKED_DOMAIN_URL}/api/devices/3", json=make_device_json("3"))
+
+        instance, device = shellhub_cluster.get_device("3")
+
+        assert instance == "us"
+        assert device.uid == "3"
+
+    def test_not_found(self, shellhub_cluster, requests_mock):
+        requests_mock.get(f"{MOCKED_DOMAIN_URL}/api/devices/3", status_code=404)
+        requests_mock.get(f"{OTHER_MOCKED_DOMAIN_URL}/api/devices/3", status_code=404)
+
+        with pytest.raises(DeviceNotFoundError):
+            shellhub_cluster.get_device("3")
+
+    def test_not_found_with_failing_instance(self, shellhub_cluster, requests_mock):
+        requests_mock.get(f"{MOCKED_DOMAIN_URL}/api/devices/3", status_code=500)
+        requests_mock.get(f"{OTHER_MOCKED_DOMAIN_URL}/api/devices/3", status_code=404)
+
+        with pytest.raises(ShellHubClusterError) as e:
+            shellhub_cluster.get_device("3")
+
+        assert list(e.value.errors) == ["eu"]
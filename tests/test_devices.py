@@ -3,7 +3,10 @@ from datetime import timezone
 
 import pytest
 
+from shellhub import ShellHubDevice
+from shellhub import ShellHubDeviceInfo
 from shellhub.exceptions import ShellHubApiError
+from tests.utils import make_device_json
 from tests.utils import MOCKED_DOMAIN_URL
 
 
@@ -22,6 +25,21 @@ class TestGetDevices:
         devices = shellhub.get_all_devices()
         assert len(devices) == 0
 
+    def test_iter_incorrect_workers(self, shellhub):
+        with pytest.raises(ValueError):
+            shellhub.iter_devices(workers=0)
+
+    def test_iter_pagination_not_overridden(self, shellhub, requests_mock):
+        listing = requests_mock.get(
+            f"{MOCKED_DOMAIN_URL}/api/devices",
+            [{"json": [make_device_json("1"), make_device_json("2")]}, {"json": [make_device_json("3")]}],
+        )
+
+        devices = list(shellhub.iter_devices(query_params={"page": 1, "per_page": 1}, per_page=2))
+
+        assert [device.uid for device in devices] == ["1", "2", "3"]
+        assert [request.qs["page"] for request in listing.request_history] == [["1"], ["2"]]
+
     def test_get_incorrect_status(self, shellhub):
         with pytest.raises(ValueError):
             shellhub.get_all_devices(status="incorrect_status")
@@ -170,6 +188,11 @@ class TestDeleteDevice:
         requests_mock.delete(f"{MOCKED_DOMAIN_URL}/api/devices/1", status_code=200)
         assert shellhub_device.delete()
 
+    def test_delete_device_timeout(self, shellhub_device, requests_mock):
+        requests_mock.delete(f"{MOCKED_DOMAIN_URL}/api/devices/1", status_code=200)
+        assert shellhub_device.delete(timeout=3)
+        assert requests_mock.last_request.timeout == 3
+
     def test_delete_device_already_deleted(self, shellhub_device, requests_mock):
         requests_mock.delete(f"{MOCKED_DOMAIN_URL}/api/devices/1", status_code=404)
         with pytest.raises(ShellHubApiError):
@@ -305,3 +328,151 @@ class TestDeviceSSHID:
     def test_acceptable_device_sshid(self, shellhub_device, shellhub):
         shellhub_device.acceptable = True
         assert shellhub_device.sshid is None
+
+
+class TestDeviceInfoPooling:
+    INFO = {
+        "id": "ubuntu",
+        "pretty_name": "Ubuntu 20.04.2 LTS",
+        "version": "v0.14.1",
+        "arch": "amd64",
+        "platform": "docker",
+    }
+
+    def test_shared_info(self):
+        first = ShellHubDeviceInfo.shared(dict(self.INFO))
+        second = ShellHubDeviceInfo.shared(dict(self.INFO))
+        assert first is second
+
+    def test_different_info(self):
+        first = ShellHubDeviceInfo.shared(dict(self.INFO))
+        second = ShellHubDeviceInfo.shared({**self.INFO, "arch": "arm64"})
+        assert first is not second
+        assert first != second
+
+    def test_info_equality(self):
+        assert ShellHubDeviceInfo(dict(self.INFO)) == ShellHubDeviceInfo(dict(self.INFO))
+        assert hash(ShellHubDeviceInfo(dict(self.INFO))) == hash(ShellHubDeviceInfo(dict(self.INFO)))
+
+    def test_info_immutable(self):
+        info = ShellHubDeviceInfo.shared(dict(self.INFO))
+        with pytest.raises(AttributeError):
+            info.arch = "arm64"
+
+    def test_devices_share_info_and_strings(self, shellhub):
+        def fresh_json(uid):
+            # Strings built at runtime, so that they are distinct objects unless the device interns them
+            return make_device_json(
+                uid,
+                info=dict(self.INFO),
+                tenant_id="".join(["tenant", "-1"]),
+                namespace="".join(["na", "mespace"]),
+                status="".join(["accep", "ted"]),
+            )
+
+        first_json, second_json = fresh_json("1"), fresh_json("2")
+        assert first_json["status"] is not second_json["status"]
+
+        first = ShellHubDevice(shellhub, first_json)
+        second = ShellHubDevice(shellhub, second_json)
+        assert first.info is second.info
+        assert first.namespace is second.namespace
+        assert first.tenant_id is second.tenant_id
+        assert first.status is second.status
+
+
+class TestOptimisticMutations:
+    @pytest.fixture
+    def optimistic_device(self, shellhub, shellhub_device):
+        shellhub._optimistic_mutations = True
+        shellhub_device.status = "pending"
+        shellhub_device.acceptable = True
+        return shellhub_device
+
+    def test_accept_without_refresh(self, optimistic_device, requests_mock):
+        requests_mock.patch(f"{MOCKED_DOMAIN_URL}/api/devices/1/accept", status_code=200)
+        call_count = requests_mock.call_count
+
+        assert optimistic_device.accept()
+
+        assert requests_mock.call_count == call_count + 1
+        assert optimistic_device.status == "accepted"
+        assert not optimistic_device.acceptable
+        assert optimistic_device.stale
+
+    def test_rename_marks_stale(self, optimistic_device, requests_mock):
+        requests_mock.put(f"{MOCKED_DOMAIN_URL}/api/devices/1", status_code=200)
+        optimistic_device.rename("new_name")
+
+        assert optimistic_device.name == "new_name"
+        assert optimistic_device.stale
+
+    def test_not_stale_by_default(self, shellhub_device, requests_mock):
+        requests_mock.put(f"{MOCKED_DOMAIN_URL}/api/devices/1", status_code=200)
+        shellhub_device.rename("new_name")
+
+        assert not shellhub_device.stale
+
+    def test_reconcile(self, shellhub, optimistic_device, requests_mock):
+        requests_mock.patch(f"{MOCKED_DOMAIN_URL}/api/devices/1/accept", status_code=200)
+        optimistic_device.accept()
+        requests_mock.get(f"{MOCKED_DOMAIN_URL}/api/devices/1", json=make_device_json(name="confirmed"))
+
+        assert shellhub.reconcile([optimistic_device]) == []
+        assert optimistic_device.name == "confirmed"
+        assert not optimistic_device.stale
+
+    def test_reconcile_missing_device(self, shellhub, optimistic_device, requests_mock):
+        requests_mock.put(f"{MOCKED_DOMAIN_URL}/api/devices/1", status_code=200)
+        optimistic_device.rename("new_name")
+        requests_mock.get(f"{MOCKED_DOMAIN_URL}/api/devices/1", status_code=404)
+
+        assert shellhub.reconcile([optimistic_device]) == [optimistic_device]
+        assert optimistic_device.stale
+
+    def test_reconcile_pages_device_list(self, shellhub, optimistic_device, requests_mock):
+        requests_mock.patch(f"{MOCKED_DOMAIN_URL}/api/devices/1/accept", status_code=200)
+        optimistic_device.accept()
+        listing = requests_mock.get(f"{MOCKED_DOMAIN_URL}/api/devices", json=[make_device_json(name="confirmed")])
+
+        assert shellhub.reconcile([optimistic_device], max_refreshes=0) == []
+        assert listing.call_count == 1
+        # Every stale device was accepted, so only accepted devices are listed
+        assert listing.last_request.qs["status"] == ["accepted"]
+        assert optimistic_device.name == "confirmed"
+        assert not optimistic_device.stale
+
+    def test_reconcile_pages_every_status(self, shellhub, optimistic_device, requests_mock):
+        requests_mock.patch(f"{MOCKED_DOMAIN_URL}/api/devices/1/accept", status_code=200)
+        optimistic_device.accept()
+        pending = ShellHubDevice(shellhub, make_device_json("2", status="pending", acceptable=True))
+        pending._stale = True
+        listing = requests_mock.get(f"{MOCKED_DOMAIN_URL}/api/devices", json=[make_device_json()])
+        requests_mock.get(f"{MOCKED_DOMAIN_URL}/api/devices/2", status_code=404)
+
+        assert shellhub.reconcile([optimistic_device, pending], max_refreshes=1) == [pending]
+        assert "status" not in listing.last_request.qs
+        assert not optimistic_device.stale
+
+    def test_reconcile_refreshes_devices_missed_by_paging(self, shellhub, optimistic_device, requests_mock):
+        requests_mock.patch(f"{MOCKED_DOMAIN_URL}/api/devices/1/accept", status_code=200)
+        optimistic_device.accept()
+        other = ShellHubDevice(shellhub, make_device_json("2", status="pending", acceptable=True))
+        requests_mock.patch(f"{MOCKED_DOMAIN_URL}/api/devices/2/accept", status_code=200)
+        shellhub._optimistic_mutations = True
+        other.accept()
+        # The accept of the second device failed behind the scenes: it isn't listed with the accepted devices
+        requests_mock.get(f"{MOCKED_DOMAIN_URL}/api/devices", json=[make_device_json()])
+        refresh = requests_mock.get(
+            f"{MOCKED_DOMAIN_URL}/api/devices/2", json=make_device_json("2", status="pending", acceptable=True)
+        )
+
+        assert shellhub.reconcile([optimistic_device, other], max_refreshes=0) == []
+        assert refresh.call_count == 1
+        assert other.status == "pending"
+        assert not other.stale
+
+    def test_reconcile_nothing_stale(self, shellhub, shellhub_device, requests_mock):
+        call_count = requests_mock.call_count
+        assert shellhub.reconcile([shellhub_device]) == []
+        assert requests_mock.call_count == call_count
@@ -0,0 +1,136 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from shellhub import FleetExecutor
+from shellhub import ShellHubDevice
+from tests.utils import make_device_json
+
+FAKE_SSH = [sys.executable, str(Path(__file__).parent / "fake_ssh.py")]
+
+
+@pytest.fixture(scope="function")
+def devices(shellhub):
+    return [ShellHubDevice(shellhub, make_device_json(str(uid), name=f"device-{uid}")) for uid in range(4)]
+
+
+@pytest.fixture(scope="function")
+def executor():
+    with FleetExecutor(ssh_command=FAKE_SSH, max_workers=2, timeout=5) as executor:
+        yield executor
+
+
+def test_run(executor, devices):
+    results = list(executor.run(devices, 'echo "$SSH_DESTINATION"'))
+
+    assert sorted(result.device.uid for result in results) == ["0", "1", "2", "3"]
+    for result in results:
+        assert result.ok
+        assert result.error is None
+        assert result.stdout == f"dev.{result.device.name}@shellhub.example.org\n"
+
+
+def test_ssh_options(devices):
+    with FleetExecutor(ssh_command=FAKE_SSH, port=2222, identity_file="id_ed25519", ssh_options=["A=b"]) as executor:
+        result = executor.run_one(devices[0], 'echo "$SSH_OPTIONS"')
+
+    options = result.stdout.splitlines()
+    assert "-p 2222" in options
+    assert "-o BatchMode=yes" in options
+    assert "-o ControlMaster=no" in options
+    assert "-i id_ed25519" in options
+    assert "-o A=b" in options
+
+
+def test_no_multiplexing_by_default(executor, devices):
+    results = [executor.run_one(devices[0], 'echo "$SSH_MASTER"') for _ in range(2)]
+
+    assert [result.stdout for result in results] == ["none\n", "none\n"]
+    assert executor._control_dir is None
+
+
+def test_multiplexing(devices, tmp_path, monkeypatch):
+    log = tmp_path / "ssh.log"
+    monkeypatch.setenv("FAKE_SSH_LOG", str(log))
+    executor = FleetExecutor(ssh_command=FAKE_SSH, control_persist=60)
+    results = [executor.run_one(device, 'echo "$SSH_MASTER"') for device in (devices[0], devices[0], devices[1])]
+    control_dir = executor._control_dir
+
+    assert [result.stdout for result in results] == ["new\n", "reused\n", "new\n"]
+    assert "-o ControlPersist=60" in executor.run_one(devices[0], 'echo "$SSH_OPTIONS"').stdout.splitlines()
+
+    executor.close()
+
+    # Each master was told to exit before its socket was removed
+    exits = log.read_text().splitlines()
+    assert len(exits) == 2
+    assert all(line.startswith(f"exit {control_dir}") for line in exits)
+    assert not Path(control_dir).exists()
+
+
+def test_exit_status(executor, devices):
+    result = executor.run_one(devices[0], "echo oops >&2; exit 3")
+
+    assert not result.ok
+    assert result.exit_status == 3
+    assert result.stderr == "oops\n"
+
+
+def test_timeout(devices):
+    with FleetExecutor(ssh_command=FAKE_SSH, timeout=0.5) as executor:
+        result = executor.run_one(devices[0], "sleep 5")
+
+    assert result.exit_status is None
+    assert "Timed out" in result.error
+    assert result.duration < 5
+
+
+def test_device_without_sshid(executor, devices):
+    devices[0].acceptable = True
+    result = executor.run_one(devices[0], "true")
+
+    assert result.exit_status is None
+    assert result.error is not None
+
+
+def test_bounded_concurrency(executor, devices):
+    start = time.monotonic()
+    list(executor.run(devices, "sleep 0.3"))
+    # 4 devices, 2 at a time
+    assert time.monotonic() - start >= 0.6
+
+
+def test_results_streamed(executor, devices):
+    commands = iter(
+        executor.run(devices[:2], 'if [ "$SSH_DESTINATION" = dev.device-0@shellhub.example.org ]; then sleep 1; fi')
+    )
+    first = next(commands)
+    assert first.device.uid == "1"
+
+
+def test_devices_consumed_lazily(executor, devices):
+    consumed = []
+
+    def device_generator():
+        for device in devices:
+            consumed.append(device)
+            yield device
+
+    results = executor.run(device_generator(), "true")
+    next(results)
+    assert len(consumed) < len(devices)
+
+
+def test_ssh_not_found(devices):
+    with FleetExecutor(ssh_command="/nonexistent/ssh") as executor:
+        result = executor.run_one(devices[0], "true")
+
+    assert result.exit_status is None
+    assert "Couldn't start ssh" in result.error
+
+
+def test_invalid_max_workers():
+    with pytest.raises(ValueError):
+        FleetExecutor(max_workers=0)
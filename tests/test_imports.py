@@ -0,0 +1,41 @@
+import subprocess
+import sys
+
+import pytest
+
+import shellhub
+
+
+def run_python(code):
+    return subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout.strip()
+
+
+def test_import_is_lazy():
+    # Regression guard for the import time: the package and its exceptions must not pull requests in
+    loaded = run_python(
+        "import sys\n"
+        "import shellhub\n"
+        "from shellhub import ShellHubApiError, __version__\n"
+        "print(sorted(m for m in ('requests', 'urllib3', 'shellhub.models.base') if m in sys.modules))"
+    )
+    assert loaded == "[]"
+
+
+@pytest.mark.parametrize("name", shellhub.__all__)
+def test_lazy_attribute_in_fresh_interpreter(name):
+    assert run_python(f"import shellhub\nprint(shellhub.{name}.__name__)") == name
+
+
+def test_star_import():
+    namespace = {}
+    exec("from shellhub import *", namespace)
+    assert set(shellhub.__all__) <= set(namespace)
+
+
+def test_dir():
+    assert set(shellhub.__all__) <= set(dir(shellhub))
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        shellhub.Unknown
@@ -0,0 +1,120 @@
+import pickle
+
+import pytest
+
+from shellhub import dump_devices
+from shellhub import dumps_devices
+from shellhub import load_devices
+from shellhub import loads_devices
+from shellhub import ShellHubBaseException
+from shellhub import ShellHubDevice
+from tests.utils import make_device_json
+
+FIELDS = [
+    "uid",
+    "name",
+    "mac_address",
+    "info",
+    "public_key",
+    "tenant_id",
+    "last_seen",
+    "online",
+    "namespace",
+    "status",
+    "status_updated_at",
+    "created_at",
+    "remote_addr",
+    "tags",
+    "acceptable",
+    "stale",
+]
+
+
+@pytest.fixture(scope="function")
+def devices(shellhub):
+    stale_device = ShellHubDevice(
+        shellhub,
+        make_device_json(
+            "2",
+            name="other",
+            status="pending",
+            online=False,
+            tags=["a", "b"],
+            acceptable=True,
+            last_seen="2024-02-03T04:05:06.123456Z",
+            info={
+                "id": "debian",
+                "pretty_name": "Debian 12",
+                "version": "v0.14.1",
+                "arch": "arm64",
+                "platform": "",
+            },
+        ),
+    )
+    stale_device._stale = True
+    return [ShellHubDevice(shellhub, make_device_json("1")), stale_device]
+
+
+def assert_same_devices(loaded, devices, shellhub):
+    assert len(loaded) == len(devices)
+    for loaded_device, device in zip(loaded, devices):
+        for field in FIELDS:
+            assert getattr(loaded_device, field) == getattr(device, field)
+        assert loaded_device._api is shellhub
+
+
+@pytest.mark.parametrize("serialization_format", ["binary", "ndjson"])
+def test_round_trip(shellhub, devices, serialization_format):
+    data = dumps_devices(devices, format=serialization_format)
+    assert_same_devices(loads_devices(data, shellhub, format=serialization_format), devices, shellhub)
+
+
+@pytest.mark.parametrize("serialization_format", ["binary", "ndjson"])
+def test_round_trip_file(shellhub, devices, serialization_format, tmp_path):
+    path = tmp_path / "devices"
+    with open(path, "wb") as fp:
+        dump_devices(devices, fp, format=serialization_format)
+    with open(path, "rb") as fp:
+        assert_same_devices(load_devices(fp, shellhub, format=serialization_format), devices, shellhub)
+
+
+def test_ndjson_is_api_format(devices):
+    lines = dumps_devices(devices, format="ndjson").splitlines()
+    assert len(lines) == 2
+    assert lines[0].startswith(b'{"uid":"1","name":"default","identity":{"mac":"06:04:ju:le:s7:08"}')
+
+
+def test_shared_info(shellhub, devices):
+    loaded = loads_devices(dumps_devices(devices), shellhub)
+    assert loaded[0].info is devices[0].info
+
+
+def test_incorrect_format(shellhub, devices):
+    with pytest.raises(ValueError):
+        dumps_devices(devices, format="xml")
+    with pytest.raises(ValueError):
+        loads_devices(b"", shellhub, format="xml")
+
+
+def test_not_a_device_list(shellhub):
+    with pytest.raises(ShellHubBaseException):
+        loads_devices(b"garbage", shellhub)
+
+
+def test_binary_refuses_arbitrary_objects(shellhub):
+    with pytest.raises(pickle.UnpicklingError):
+        loads_devices(b"SHD\x01" + pickle.dumps([(ShellHubBaseException,)]), shellhub)
+
+
+def test_to_dict_from_dict(shellhub, devices):
+    device = ShellHubDevice.from_dict(shellhub, devices[1].to_dict())
+    assert_same_devices([device], devices[1:], shellhub)
+
+
+def test_pickle_device(shellhub, devices):
+    device = pickle.loads(pickle.dumps(devices[1]))
+
+    assert device._api is None
+    device.attach(shellhub)
+    assert_same_devices([device], devices[1:], shellhub)
+    assert device.info is devices[1].info
@@ -0,0 +1,136 @@
+import pytest
+import requests
+
+from shellhub import DeviceNotFoundError
+from shellhub import RequestsTransport
+from shellhub import ShellHub
+from shellhub import ShellHubApiError
+from shellhub import ShellHubAuthenticationError
+from shellhub import ShellHubSimulator
+from shellhub import Transport
+from tests.utils import MOCKED_DOMAIN_URL
+
+SIMULATED_URL = "http://shellhub.local"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(scope="function")
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture(scope="function")
+def simulator(clock):
+    simulator = ShellHubSimulator(users={"john.doe": "dolphin"}, token_ttl=60, clock=clock)
+    simulator.add_device(uid="1", name="first", status="accepted")
+    simulator.add_device(uid="2", name="second", status="pending")
+    return simulator
+
+
+@pytest.fixture(scope="function")
+def simulated_shellhub(simulator):
+    return ShellHub(username="john.doe", password="dolphin", endpoint_or_url=SIMULATED_URL, transport=simulator)
+
+
+def test_incorrect_password(simulator):
+    with pytest.raises(ShellHubAuthenticationError):
+        ShellHub(username="john.doe", password="shark", endpoint_or_url=SIMULATED_URL, transport=simulator)
+
+
+def test_unauthenticated_request(simulator):
+    response = simulator.request("GET", f"{SIMULATED_URL}/api/devices")
+    assert response.status_code == 401
+
+
+def test_unknown_endpoint(simulated_shellhub):
+    assert simulated_shellhub.make_request("/api/unknown", "GET").status_code == 404
+
+
+class TestDevices:
+    def test_get_device(self, simulated_shellhub):
+        device = simulated_shellhub.get_device("1")
+        assert device.name == "first"
+        assert device.status == "accepted"
+        assert not device.acceptable
+
+    def test_device_not_found(self, simulated_shellhub):
+        with pytest.raises(DeviceNotFoundError):
+            simulated_shellhub.get_device("3")
+
+    def test_pagination(self, simulator, simulated_shellhub):
+        for uid in range(3, 251):
+            simulator.add_device(uid=str(uid), name=f"device-{uid}")
+        devices = simulated_shellhub.get_all_devices()
+        assert [device.uid for device in devices] == [str(uid) for uid in range(1, 251)]
+        assert simulator.request_count == 1 + 3
+
+    def test_status_filter(self, simulated_shellhub):
+        assert [device.uid for device in simulated_shellhub.get_all_devices(status="pending")] == ["2"]
+
+    def test_accept(self, simulator, simulated_shellhub):
+        device = simulated_shellhub.get_device("2")
+        assert device.acceptable
+        assert device.accept()
+        assert device.status == "accepted"
+        assert simulator.devices["2"]["status"] == "accepted"
+        assert simulated_shellhub.get_all_devices(status="pending") == []
+
+    def test_rename(self, simulator, simulated_shellhub):
+        device = simulated_shellhub.get_device("1")
+        assert device.rename("renamed")
+        assert simulated_shellhub.get_device("1").name == "renamed"
+        assert simulated_shellhub.get_device("2").rename("first")
+
+    def test_rename_conflict(self, simulated_shellhub):
+        with pytest.raises(ShellHubApiError):
+            simulated_shellhub.get_device("1").rename("second")
+
+    def test_delete(self, simulator, simulated_shellhub):
+        device = simulated_shellhub.get_device("1")
+        assert device.delete()
+        assert "1" not in simulator.devices
+        with pytest.raises(DeviceNotFoundError):
+            device.delete()
+
+
+class TestTokenExpiry:
+    def test_relogin_after_expiry(self, clock, simulator, simulated_shellhub):
+        token = simulated_shellhub._access_token
+        clock.now += 61
+        assert simulated_shellhub.get_device("1").uid == "1"
+        assert simulated_shellhub._access_token != token
+
+    def test_relogin_after_expire_tokens(self, simulator, simulated_shellhub):
+        token = simulated_shellhub._access_token
+        simulator.expire_tokens()
+        assert simulated_shellhub.get_device("1").uid == "1"
+        assert simulated_shellhub._access_token != token
+
+
+def test_requests_transport_session(requests_mock):
+    requests_mock.post(f"{MOCKED_DOMAIN_URL}/api/login", json={"token": "jwt_token"})
+    requests_mock.get(f"{MOCKED_DOMAIN_URL}/api/devices", json=[])
+    with requests.Session() as session:
+        shellhub = ShellHub(
+            username="john.doe",
+            password="dolphin",
+            endpoint_or_url=MOCKED_DOMAIN_URL,
+            transport=RequestsTransport(session),
+        )
+        assert shellhub.get_all_devices() == []
+    assert requests_mock.last_request.headers["Authorization"] == "Bearer jwt_token"
+
+
+def test_transport_without_request():
+    class IncompleteTransport(Transport):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteTransport()
@@ -1 +1,33 @@
 MOCKED_DOMAIN_URL = "http://shellhub.example.org"
+OTHER_MOCKED_DOMAIN_URL = "http://shellhub.example.com"
+
+
+def make_device_json(uid="1", **overrides):
+    device_json = {
+        "uid": uid,
+        "name": "default",
+        "identity": {"mac": "06:04:ju:le:s7:08"},
+        "info": {
+            "id": "ubuntu",
+            "pretty_name": "Ubuntu 20.04.2 LTS",
+            "version": "v0.14.1",
+            "arch": "amd64",
+            "platform": "docker",
+        },
+        "public_key": "-----BEGIN RSA PUBLIC KEY-----\nxxx\nxxx\nxxx\nxxx\nxxx\nxxx\n-----END RSA PUBLIC KEY-----\n",
+        "tenant_id": "1",
+        "last_seen": "1970-01-01T00:00:00Z",
+        "online": True,
+        "namespace": "dev",
+        "status": "accepted",
+        "status_updated_at": "1970-01-01T00:00:00Z",
+        "created_at": "1970-01-01T00:00:00Z",
+        "remote_addr": "0.0.0.0",
+        "position": {"latitude": 0, "longitude": 0},
+        "tags": [],
+        "public_url": False,
+        "public_url_address": "",
+        "acceptable": False,
+    }
+    device_json.update(overrides)
+    return device_json